@@ -0,0 +1,234 @@
+"""
+Headless benchmark of the cost per row of the command search widgets. The
+dividers of the manager menu are created with inline style sheets, as they
+used to be, and with the shared style sheet of the search widget. The rows
+of the commands widget are populated and painted for a synthetic menubar.
+Durations are divided by the amount of rows and written to a json file.
+
+::
+    python benchmarks/rows.py --rows 200
+"""
+import os
+import sys
+import json
+import argparse
+import platform
+from timeit import default_timer as clock
+
+import run
+
+# ----------------------------------------------------------------------------
+
+OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rows.json")
+ROWS = 200
+SIZE = 10000
+REPEAT = 10
+
+LABEL_SS = "QLabel{font: bold; color: orange; border: 0px;}"
+FRAME_SS = "QFrame{color: gray; margin: 0 12 0 12;}"
+
+# ----------------------------------------------------------------------------
+
+def createInlineDivider(parent, group):
+    """
+    Create a divider that parses its own style sheets, the way dividers were
+    created before the shared style sheet.
+
+    :param QWidget parent:
+    :param str group:
+    :return: Divider
+    :rtype: QWidget
+    """
+    from commandSearch.ui import utils
+
+    widget = utils.QWidget(parent)
+
+    label = utils.QLabel(widget)
+    label.setText(group)
+    label.setFixedHeight(12)
+    label.setStyleSheet(LABEL_SS)
+
+    sep01 = utils.QFrame(widget)
+    sep02 = utils.QFrame(widget)
+
+    for sep in [sep01, sep02]:
+        sep.setStyleSheet(FRAME_SS)
+        sep.setFrameStyle(utils.QFrame.HLine)
+        sep.setSizePolicy(
+            utils.QSizePolicy.Expanding,
+            utils.QSizePolicy.Minimum
+        )
+
+    layout = utils.QHBoxLayout(widget)
+    layout.addWidget(sep01)
+    layout.addWidget(label)
+    layout.addWidget(sep02)
+
+    layout.setContentsMargins(0, 0, 0, 0)
+    layout.setSpacing(0)
+    widget.setFixedHeight(12)
+
+    return widget
+
+def createSharedDivider(parent, group):
+    """
+    :param QWidget parent:
+    :param str group:
+    :return: Divider styled by the shared style sheet
+    :rtype: QWidget
+    """
+    from commandSearch.ui import utils
+    return utils.Divider(parent, group)
+
+def measureDividers(app, create, rows, repeat):
+    """
+    Create and show the amount of dividers in a container that holds the
+    shared style sheet, as the search widget does.
+
+    :param QApplication app:
+    :param callable create:
+    :param int rows:
+    :param int repeat:
+    :return: Durations per row in seconds
+    :rtype: list
+    """
+    from commandSearch.ui import utils
+
+    timings = []
+    for _ in range(repeat):
+        container = utils.QWidget()
+        container.setStyleSheet(utils.STYLE_SHEET)
+        layout = utils.QVBoxLayout(container)
+        container.show()
+        app.processEvents()
+
+        t = clock()
+        for i in range(rows):
+            layout.addWidget(create(container, "Group {0}".format(i)))
+        app.processEvents()
+        timings.append((clock() - t) / rows)
+
+        container.close()
+        container.deleteLater()
+        app.processEvents()
+
+    return timings
+
+def measureCommands(app, rows, repeat):
+    """
+    Populate and paint the commands widget with the amount of rows, the
+    matches are taken from the word of the synthetic menubar that matches
+    the most commands. The widget is emptied before every populate, 
+    otherwise the rows are reconciled with identical rows and nothing 
+    changes.
+
+    :param QApplication app:
+    :param int rows:
+    :param int repeat:
+    :return: Populate and paint durations per row in seconds
+    :rtype: tuple
+    """
+    import synthetic
+    from commandSearch import commands
+    from commandSearch.ui import commands as widgets
+    from commandSearch.ui import utils
+
+    matches = []
+    for word in synthetic.WORDS:
+        found = commands.filter(word, None, rows)
+        if len(found) > len(matches):
+            matches = found
+
+    rows = len(matches) or 1
+
+    container = utils.QWidget()
+    container.setStyleSheet(utils.STYLE_SHEET)
+    layout = utils.QVBoxLayout(container)
+    widget = widgets.Commands(container)
+    layout.addWidget(widget)
+    container.resize(300, rows * 24)
+    container.show()
+    app.processEvents()
+
+    populate, paint = [], []
+    for _ in range(repeat):
+        widget.clear()
+        app.processEvents()
+
+        t = clock()
+        widget.populate(matches)
+        populate.append((clock() - t) / rows)
+
+        t = clock()
+        widget.grab()
+        paint.append((clock() - t) / rows)
+
+    container.close()
+    return populate, paint
+
+# ----------------------------------------------------------------------------
+
+def benchmark(rows=ROWS, size=SIZE, repeat=REPEAT, seed=0):
+    """
+    :param int rows: amount of rows per measurement
+    :param int size: amount of menu items of the synthetic menubar
+    :param int repeat:
+    :param int seed:
+    :return: Results
+    :rtype: dict
+    """
+    app, window = run.setup()
+
+    import stubs
+    import synthetic
+
+    generator = synthetic.build(window, size, seed)
+    stubs.State.images = generator.images
+
+    from commandSearch import commands
+    commands.store(refresh=True)
+
+    populate, paint = measureCommands(app, rows, repeat)
+    return {
+        "rows": rows,
+        "size": size,
+        "divider": {
+            "inline": run.summarize(
+                measureDividers(app, createInlineDivider, rows, repeat)
+            ),
+            "shared": run.summarize(
+                measureDividers(app, createSharedDivider, rows, repeat)
+            ),
+        },
+        "populate": run.summarize(populate),
+        "paint": run.summarize(paint),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=ROWS)
+    parser.add_argument("--size", type=int, default=SIZE)
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=OUTPUT)
+    args = parser.parse_args()
+
+    result = benchmark(args.rows, args.size, args.repeat, args.seed)
+    result["python"] = platform.python_version()
+    result["platform"] = platform.platform()
+
+    with open(args.output, "w") as f:
+        json.dump(result, f, indent=2, sort_keys=True)
+
+    sys.stdout.write(
+        "divider inline {0:.3f}ms shared {1:.3f}ms, "
+        "populate {2:.3f}ms paint {3:.3f}ms per row\n".format(
+            result["divider"]["inline"]["p50"],
+            result["divider"]["shared"]["p50"],
+            result["populate"]["p50"],
+            result["paint"]["p50"],
+        )
+    )
+
+if __name__ == "__main__":
+    main()
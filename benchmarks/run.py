@@ -0,0 +1,315 @@
+"""
+Headless benchmark of the command search. Maya is replaced by the stand-ins
+in the stubs module and its menubar by a synthetic menubar, Qt runs on the
+offscreen platform so no display is needed.
+
+Every size is benchmarked in its own process, so the peak memory is not
+polluted by the previous sizes. Instead of a synthetic menubar, a menubar
+recorded in Maya can be replayed from a fixture file. Measured are the
+time to process the menubar and to load the commands from the cache, the
+latency of every query in the keystroke corpus, the time to populate and
+paint the results and the peak memory. The results are written to a json
+file.
+
+::
+    python benchmarks/run.py --sizes 1600 10000 100000
+    python benchmarks/run.py --fixture menus.json
+"""
+import os
+import sys
+import json
+import argparse
+import platform
+import tempfile
+import subprocess
+from timeit import default_timer as clock
+
+# ----------------------------------------------------------------------------
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIZES = [1600, 10000, 100000]
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "keystrokes.txt")
+OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results.json")
+LIMIT = 50
+PERCENTILES = [50, 90, 99]
+
+# ----------------------------------------------------------------------------
+
+def readCorpus(path):
+    """
+    Read the keystroke corpus, every line holds the content of the search
+    field after a keystroke, sessions are separated by an empty line.
+
+    :param str path:
+    :return: Sessions of search strings
+    :rtype: list
+    """
+    sessions = [[]]
+    with open(path, "r") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if line:
+                sessions[-1].append(line)
+            elif sessions[-1]:
+                sessions.append([])
+
+    return [s for s in sessions if s]
+
+def summarize(timings):
+    """
+    :param list timings: durations in seconds
+    :return: Count, mean, max and percentiles in milliseconds
+    :rtype: dict
+    """
+    timings = sorted(t * 1000 for t in timings)
+    if not timings:
+        return {"count": 0}
+
+    summary = {
+        "count": len(timings),
+        "mean": sum(timings) / len(timings),
+        "max": timings[-1],
+    }
+    for p in PERCENTILES:
+        i = min(len(timings) - 1, int(round(p / 100.0 * (len(timings) - 1))))
+        summary["p{0}".format(p)] = timings[i]
+
+    return summary
+
+def getPeakMemory():
+    """
+    :return: Peak resident memory of the process in kilobytes
+    :rtype: int/None
+    """
+    try:
+        import resource
+    except ImportError:
+        return
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+# ----------------------------------------------------------------------------
+
+def setup():
+    """
+    Create the offscreen application and main window and install the maya
+    stand-ins. The user directories are redirected to a temporary directory
+    so the caches, pins and usage of the user are left alone.
+
+    :return: Application and main window
+    :rtype: tuple
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    os.environ["XDG_CONFIG_HOME"] = tempfile.mkdtemp(prefix="commandSearch")
+    os.environ.pop("LOCALAPPDATA", None)
+
+    from PySide2 import QtWidgets
+    import stubs
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    window = QtWidgets.QMainWindow()
+    window.setObjectName("MayaWindow")
+
+    stubs.install(window)
+    sys.path.insert(0, os.path.join(ROOT, "scripts"))
+    return app, window
+
+def benchmark(size, corpus, limit=LIMIT, seed=0, fixture=None, traced=False):
+    """
+    Benchmark the command search against a synthetic menubar of the
+    provided size, or against the menubar recorded in the fixture.
+
+    :param int/None size: amount of menu items
+    :param list corpus: sessions of search strings
+    :param int limit: amount of ranked matches per query
+    :param int seed:
+    :param str/None fixture: path of a recorded menubar
+    :param bool traced: include the timings of the traced spans
+    :return: Results
+    :rtype: dict
+    """
+    app, window = setup()
+
+    import stubs
+    import synthetic
+
+    # build menubar
+    t = clock()
+    if fixture:
+        from commandSearch import fixture as fixtures
+        data = fixtures.read(fixture)
+        _, stubs.State.images = fixtures.replay(data, window)
+        size = fixtures.count(data)
+    else:
+        generator = synthetic.build(window, size, seed)
+        stubs.State.images = generator.images
+    built = clock() - t
+    memory = getPeakMemory()
+
+    from commandSearch import commands, trace
+    from commandSearch.ui import commands as widgets
+
+    trace.enable(traced)
+
+    # crawl
+    t = clock()
+    commands.store(refresh=True)
+    crawl = clock() - t
+    count = len(commands.get())
+
+    # crawl again, static menus are not rebuilt
+    t = clock()
+    commands.store(refresh=True)
+    recrawl = clock() - t
+
+    # load from cache
+    t = clock()
+    commands.store()
+    load = clock() - t
+
+    # query
+    typed, cold = [], []
+    for searches in corpus:
+        session = commands.Session()
+        for search in searches:
+            t = clock()
+            commands.filter(search, session, limit)
+            typed.append(clock() - t)
+
+            t = clock()
+            commands.filter(search, None, limit)
+            cold.append(clock() - t)
+
+    # populate and paint
+    widget = widgets.Commands()
+    widget.resize(300, 600)
+    widget.show()
+    app.processEvents()
+
+    populate, paint = [], []
+    for searches in corpus:
+        matches = commands.filter(searches[-1], None, limit)
+
+        t = clock()
+        widget.populate(matches)
+        populate.append(clock() - t)
+
+        t = clock()
+        widget.grab()
+        paint.append(clock() - t)
+
+    widget.close()
+
+    result = {
+        "size": size,
+        "fixture": fixture,
+        "commands": count,
+        "build": built,
+        "crawl": crawl,
+        "recrawl": recrawl,
+        "load": load,
+        "query": summarize(typed),
+        "queryCold": summarize(cold),
+        "populate": summarize(populate),
+        "paint": summarize(paint),
+        "memory": {"menubar": memory, "peak": getPeakMemory()},
+    }
+    if traced:
+        result["trace"] = trace.stats()
+
+    return result
+
+# ----------------------------------------------------------------------------
+
+def run(
+        sizes, output, corpus=CORPUS, limit=LIMIT, seed=0, fixture=None,
+        traced=False
+    ):
+    """
+    Benchmark every size in its own process and write the results. When a
+    fixture is provided, the recorded menubar is benchmarked instead.
+
+    :param list sizes:
+    :param str output: path of the json file
+    :param str corpus: path of the keystroke corpus
+    :param int limit:
+    :param int seed:
+    :param str/None fixture: path of a recorded menubar
+    :param bool traced: include the timings of the traced spans
+    """
+    if fixture:
+        jobs = [["--fixture", os.path.abspath(fixture)]]
+    else:
+        jobs = [["--size", str(size)] for size in sizes]
+
+    results = []
+    for job in jobs:
+        handle, path = tempfile.mkstemp(suffix=".json")
+        os.close(handle)
+
+        try:
+            subprocess.check_call([
+                sys.executable, os.path.abspath(__file__),
+                "--child",
+                "--output", path,
+                "--corpus", corpus,
+                "--limit", str(limit),
+                "--seed", str(seed),
+            ] + job + (["--trace"] if traced else []))
+            with open(path, "r") as f:
+                results.append(json.load(f))
+        finally:
+            os.remove(path)
+
+    data = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "limit": limit,
+        "seed": seed,
+        "results": results,
+    }
+    with open(output, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+    for result in results:
+        sys.stdout.write(
+            "{size:>7} items: crawl {crawl:.3f}s, load {load:.3f}s, "
+            "query p50 {p50:.2f}ms p99 {p99:.2f}ms, "
+            "peak {peak} KB\n".format(
+                p50=result["query"]["p50"],
+                p99=result["query"]["p99"],
+                peak=result["memory"]["peak"],
+                **result
+            )
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--size", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--fixture", help="recorded menubar to replay")
+    parser.add_argument("--output", default=OUTPUT)
+    parser.add_argument("--corpus", default=CORPUS)
+    parser.add_argument("--limit", type=int, default=LIMIT)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--trace", action="store_true", help="include spans")
+    args = parser.parse_args()
+
+    if not args.child:
+        run(
+            args.sizes, args.output, args.corpus, args.limit, args.seed,
+            args.fixture, args.trace
+        )
+        return
+
+    result = benchmark(
+        args.size, readCorpus(args.corpus), args.limit, args.seed,
+        args.fixture, args.trace
+    )
+    with open(args.output, "w") as f:
+        json.dump(result, f)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Headless benchmark of the startup cost of the command search. Measured are
+the time to import the package, the time to install the search widget and
+the modules of the package that were imported by then. Qt and the Maya
+stand-ins are loaded before the timing starts, as they are already loaded
+in Maya. Every sample is measured in its own process, so nothing is cached
+between samples. The results are written to a json file and the process
+exits with an error if the median exceeds the budget.
+
+::
+    python benchmarks/startup.py --samples 10
+"""
+import os
+import sys
+import json
+import argparse
+import platform
+import tempfile
+import subprocess
+from timeit import default_timer as clock
+
+import run
+
+# ----------------------------------------------------------------------------
+
+OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup.json")
+SAMPLES = 10
+IMPORT_BUDGET = 20
+INSTALL_BUDGET = 50
+
+# ----------------------------------------------------------------------------
+
+def getModules():
+    """
+    :return: Names of the imported modules of the package
+    :rtype: list
+    """
+    return sorted(
+        name for name, module in sys.modules.items()
+        if module and name.startswith("commandSearch")
+    )
+
+def measure():
+    """
+    Import the package and install the search widget into a status line.
+
+    :return: Import and install durations in seconds and imported modules
+    :rtype: dict
+    """
+    app, window = run.setup()
+
+    import stubs
+    from PySide2 import QtWidgets
+
+    statusLine = QtWidgets.QWidget(window)
+    statusLine.setObjectName("StatusLine")
+    QtWidgets.QHBoxLayout(statusLine)
+    stubs.State.statusLine = statusLine
+
+    t = clock()
+    import commandSearch
+    imported = clock() - t
+    importModules = getModules()
+
+    t = clock()
+    commandSearch.install()
+    installed = clock() - t
+
+    return {
+        "import": imported,
+        "install": installed,
+        "modules": {"import": importModules, "install": getModules()},
+    }
+
+# ----------------------------------------------------------------------------
+
+def benchmark(samples=SAMPLES):
+    """
+    Measure the startup in a new process for every sample.
+
+    :param int samples:
+    :return: Results
+    :rtype: dict
+    """
+    imports, installs, modules = [], [], None
+    for _ in range(samples):
+        handle, path = tempfile.mkstemp(suffix=".json")
+        os.close(handle)
+
+        try:
+            subprocess.check_call([
+                sys.executable, os.path.abspath(__file__),
+                "--child",
+                "--output", path,
+            ])
+            with open(path, "r") as f:
+                result = json.load(f)
+        finally:
+            os.remove(path)
+
+        imports.append(result["import"])
+        installs.append(result["install"])
+        modules = result["modules"]
+
+    return {
+        "import": run.summarize(imports),
+        "install": run.summarize(installs),
+        "modules": modules,
+        "budget": {"import": IMPORT_BUDGET, "install": INSTALL_BUDGET},
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--samples", type=int, default=SAMPLES)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--output", default=OUTPUT)
+    args = parser.parse_args()
+
+    if args.child:
+        with open(args.output, "w") as f:
+            json.dump(measure(), f)
+        return
+
+    result = benchmark(args.samples)
+    result["python"] = platform.python_version()
+    result["platform"] = platform.platform()
+
+    with open(args.output, "w") as f:
+        json.dump(result, f, indent=2, sort_keys=True)
+
+    imported = result["import"]["p50"]
+    installed = result["install"]["p50"]
+    sys.stdout.write(
+        "import {0:.2f}ms (budget {1}ms), install {2:.2f}ms (budget {3}ms), "
+        "{4} modules\n".format(
+            imported, IMPORT_BUDGET,
+            installed, INSTALL_BUDGET,
+            len(result["modules"]["install"])
+        )
+    )
+
+    if imported > IMPORT_BUDGET or installed > INSTALL_BUDGET:
+        sys.exit("Startup exceeds the budget")
+
+if __name__ == "__main__":
+    main()
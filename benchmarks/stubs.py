@@ -0,0 +1,187 @@
+"""
+Lightweight stand-ins for the Maya modules used by the command search, so
+the package can be imported and benchmarked with an offscreen Qt outside
+of Maya. Only the calls made by the command search are implemented.
+
+::
+    import stubs
+    stubs.install(window)
+"""
+import os
+import sys
+import types
+import tempfile
+
+# ----------------------------------------------------------------------------
+
+QT_VERSION = "5.12.5"
+MAYA_VERSION = "2020"
+API_VERSION = 20200000
+
+# ----------------------------------------------------------------------------
+
+class State(object):
+    """
+    Shared state of the stand-ins, the main window is set by install.
+    """
+    window = None
+    statusLine = None
+    appDir = None
+    plugins = []
+    images = {}
+
+# ----------------------------------------------------------------------------
+
+def getPointer(widget):
+    import shiboken2
+    return int(shiboken2.getCppPointer(widget)[0])
+
+def getObject(pointer):
+    import shiboken2
+    from PySide2.QtCore import QObject
+    return shiboken2.wrapInstance(pointer, QObject)
+
+# ----------------------------------------------------------------------------
+
+def about(**kwargs):
+    if kwargs.get("qtVersion"):
+        return QT_VERSION
+    if kwargs.get("version"):
+        return MAYA_VERSION
+    if kwargs.get("apiVersion"):
+        return API_VERSION
+    if kwargs.get("uiLanguage"):
+        return "en_US"
+    if kwargs.get("batch"):
+        return False
+
+def internalVar(**kwargs):
+    if State.appDir is None:
+        State.appDir = tempfile.mkdtemp(prefix="commandSearch")
+
+    path = State.appDir
+    if kwargs.get("userPrefDir"):
+        path = os.path.join(path, "prefs")
+    elif kwargs.get("userShelfDir"):
+        path = os.path.join(path, "prefs", "shelves")
+
+    if not os.path.exists(path):
+        os.makedirs(path)
+
+    return path + "/"
+
+def pluginInfo(*args, **kwargs):
+    if kwargs.get("listPlugins"):
+        return list(State.plugins)
+
+def menuItem(name, **kwargs):
+    if kwargs.get("image"):
+        return State.images.get(name, "")
+
+def tabLayout(*args, **kwargs):
+    if kwargs.get("childArray"):
+        return []
+
+def shelfLayout(*args, **kwargs):
+    if kwargs.get("childArray"):
+        return []
+
+def runTimeCommand(*args, **kwargs):
+    if kwargs.get("commandArray"):
+        return []
+
+# ----------------------------------------------------------------------------
+
+class MQtUtil(object):
+    @staticmethod
+    def mainWindow():
+        return getPointer(State.window)
+
+    @staticmethod
+    def fullName(pointer):
+        return getObject(pointer).objectName()
+
+    @staticmethod
+    def findControl(name):
+        if State.statusLine and name == State.statusLine.objectName():
+            return getPointer(State.statusLine)
+
+    @staticmethod
+    def findLayout(name):
+        return
+
+    @staticmethod
+    def findMenuItem(name):
+        return
+
+class MSceneMessage(object):
+    kAfterPluginLoad = 0
+    kAfterPluginUnload = 1
+
+    @staticmethod
+    def addStringArrayCallback(message, func):
+        return id(func)
+
+class MMessage(object):
+    @staticmethod
+    def removeCallback(callback):
+        return
+
+def evalMel(command):
+    if "gStatusLine" in command and State.statusLine:
+        return State.statusLine.objectName()
+
+def executeDeferred(func, *args, **kwargs):
+    func(*args, **kwargs)
+
+# ----------------------------------------------------------------------------
+
+def install(window, statusLine=None):
+    """
+    Register the stand-in maya modules, the provided window is returned as
+    Maya's main window.
+
+    :param QMainWindow window:
+    :param QWidget/None statusLine:
+    """
+    State.window = window
+    State.statusLine = statusLine
+
+    maya = types.ModuleType("maya")
+    maya.__path__ = []
+
+    cmds = types.ModuleType("maya.cmds")
+    cmds.about = about
+    cmds.internalVar = internalVar
+    cmds.pluginInfo = pluginInfo
+    cmds.menuItem = menuItem
+    cmds.tabLayout = tabLayout
+    cmds.shelfLayout = shelfLayout
+    cmds.runTimeCommand = runTimeCommand
+    cmds.evalDeferred = executeDeferred
+
+    omui = types.ModuleType("maya.OpenMayaUI")
+    omui.MQtUtil = MQtUtil
+
+    om = types.ModuleType("maya.OpenMaya")
+    om.MSceneMessage = MSceneMessage
+    om.MMessage = MMessage
+
+    mel = types.ModuleType("maya.mel")
+    mel.eval = evalMel
+
+    utils = types.ModuleType("maya.utils")
+    utils.executeDeferred = executeDeferred
+
+    maya.cmds = cmds
+    maya.OpenMayaUI = omui
+    maya.OpenMaya = om
+    maya.mel = mel
+    maya.utils = utils
+
+    sys.modules["maya"] = maya
+    sys.modules["maya.cmds"] = cmds
+    sys.modules["maya.OpenMayaUI"] = omui
+    sys.modules["maya.OpenMaya"] = om
+    sys.modules["maya.mel"] = mel
+    sys.modules["maya.utils"] = utils
@@ -0,0 +1,185 @@
+"""
+Generate synthetic menubars that resemble Maya's main menubar. The menus
+are filled with QWidgetAction items and option boxes the same way Maya
+creates them, a part of the menus is dynamic and only builds its items
+when its about to show signal is emitted.
+
+::
+    import synthetic
+    menubar = synthetic.build(window, 10000)
+"""
+import random
+
+# ----------------------------------------------------------------------------
+
+TOP_MENUS = 20
+MAX_DEPTH = 4
+SUBMENU_CHANCE = 0.08
+OPTION_CHANCE = 0.15
+IMAGE_CHANCE = 0.6
+DYNAMIC_CHANCE = 0.2
+
+WORDS = [
+    "Poly", "Bevel", "Extrude", "Bridge", "Merge", "Split", "Combine",
+    "Separate", "Smooth", "Reduce", "Mirror", "Cleanup", "Triangulate",
+    "Quadrangulate", "Subdivide", "Fill", "Hole", "Edge", "Loop", "Ring",
+    "Vertex", "Face", "Normal", "Soften", "Harden", "Reverse", "Conform",
+    "UV", "Editor", "Planar", "Cylindrical", "Spherical", "Automatic",
+    "Unfold", "Layout", "Sew", "Cut", "Curve", "Surface", "Loft", "Revolve",
+    "Birail", "Boundary", "Trim", "Rebuild", "Attach", "Detach", "Skin",
+    "Bind", "Weights", "Paint", "Joint", "Tool", "IK", "Handle", "Spline",
+    "Constraint", "Parent", "Point", "Orient", "Aim", "Scale", "Deformer",
+    "Blend", "Shape", "Lattice", "Wrap", "Cluster", "Nonlinear", "Bend",
+    "Twist", "Wave", "Key", "Set", "Graph", "Dope", "Sheet", "Playblast",
+    "Bake", "Simulation", "Cache", "Create", "Delete", "History", "Freeze",
+    "Transformations", "Center", "Pivot", "Group", "Ungroup", "Duplicate",
+    "Special", "Instance", "Snap", "Align", "Render", "View", "Settings",
+    "Hypershade", "Light", "Camera", "Texture", "Material", "Assign",
+    "Nucleus", "Cloth", "Fluid", "Particle", "Emitter", "Field", "Hair",
+    "Outliner", "Node", "Attribute", "Spreadsheet", "Channel", "Box",
+    "Display", "Wireframe", "Shaded", "Isolate", "Select", "Grow", "Shrink",
+    "Convert", "Selection", "Component", "Object", "Mode", "Options",
+]
+
+# ----------------------------------------------------------------------------
+
+class Generator(object):
+    """
+    Generator
+
+    Builds a menubar with the provided amount of items. Items are added to
+    a random menu until the size is reached, every now and then a new sub
+    menu is created instead. Dynamic menus keep their items in a list and
+    create them when they are about to show.
+
+    :param QMenuBar menubar:
+    :param int seed:
+    """
+    def __init__(self, menubar, seed=0):
+        from PySide2 import QtWidgets
+
+        self.qt = QtWidgets
+        self.menubar = menubar
+        self.random = random.Random(seed)
+        self.menus = []
+        self.pending = {}
+        self.images = {}
+        self.count = 0
+
+    # ------------------------------------------------------------------------
+
+    def getLabel(self):
+        words = self.random.sample(WORDS, self.random.randint(1, 3))
+        return " ".join(words)
+
+    def getName(self, prefix):
+        self.count += 1
+        return "{0}{1}".format(prefix, self.count)
+
+    # ------------------------------------------------------------------------
+
+    def addMenu(self, parent, depth):
+        """
+        :param QMenuBar/QMenu parent:
+        :param int depth:
+        :return: Menu
+        :rtype: QMenu
+        """
+        menu = self.qt.QMenu(self.getLabel(), parent)
+        menu.setObjectName(self.getName("menu"))
+        parent.addMenu(menu)
+
+        if depth and self.random.random() < DYNAMIC_CHANCE:
+            self.pending[menu] = []
+            menu.aboutToShow.connect(lambda m=menu: self.buildMenu(m))
+
+        self.menus.append((menu, depth))
+        return menu
+
+    def addItem(self, menu):
+        """
+        :param QMenu menu:
+        """
+        spec = (
+            self.getLabel(),
+            self.getName("menuItem"),
+            self.random.random() < OPTION_CHANCE,
+        )
+
+        if self.random.random() < IMAGE_CHANCE:
+            self.images[spec[1]] = spec[0].replace(" ", "") + ".png"
+
+        if menu in self.pending:
+            self.pending[menu].append(spec)
+        else:
+            self.createItem(menu, *spec)
+
+    def createItem(self, menu, label, name, option):
+        """
+        Create the item the same way Maya does, as a widget action directly
+        followed by its option box.
+
+        :param QMenu menu:
+        :param str label:
+        :param str name:
+        :param bool option:
+        """
+        action = self.qt.QWidgetAction(menu)
+        action.setText(label)
+        action.setObjectName(name)
+        menu.addAction(action)
+
+        if not option:
+            return
+
+        box = self.qt.QWidgetAction(menu)
+        box.setObjectName(name + "Option")
+        box.setProperty("isOptionBox", True)
+        menu.addAction(box)
+
+    def buildMenu(self, menu):
+        """
+        Create the items of a dynamic menu, called when the menu is about to
+        show.
+
+        :param QMenu menu:
+        """
+        for spec in self.pending.pop(menu, []):
+            self.createItem(menu, *spec)
+
+    # ------------------------------------------------------------------------
+
+    def build(self, size):
+        """
+        :param int size: amount of items
+        """
+        for _ in range(TOP_MENUS):
+            self.addMenu(self.menubar, 0)
+
+        for _ in range(size):
+            menu, depth = self.random.choice(self.menus)
+            if depth < MAX_DEPTH and self.random.random() < SUBMENU_CHANCE:
+                menu = self.addMenu(menu, depth + 1)
+
+            self.addItem(menu)
+
+# ----------------------------------------------------------------------------
+
+def build(window, size, seed=0):
+    """
+    Build a synthetic menubar in the window.
+
+    :param QMainWindow window:
+    :param int size: amount of items
+    :param int seed:
+    :return: Generator holding the menubar and the item images
+    :rtype: Generator
+    """
+    from PySide2 import QtWidgets
+
+    menubar = QtWidgets.QMenuBar(window)
+    menubar.setObjectName("MainMenuBar")
+
+    generator = Generator(menubar, seed)
+    generator.build(size)
+    return generator
@@ -16,11 +16,18 @@ Note
 Every time the UI is opened for the first time in a new session 
 of Maya, the script loops over all of Mayas MenuBar content to 
 retrieve all of the its information and store it in an easy accessible 
-format. Since its over 1600 buttons, this process will take a few 
-seconds.
+format. Since its over 1600 buttons, this process is done in small 
+steps without blocking Maya, the commands processed so far can already 
+be searched. The result is cached to disk, as long as the Maya version, ui 
+language and loaded plugins don't change, following sessions will load 
+the commands from the cache.
 
-The commands can always be refreshed by clicking on the magnifying
-glass button.
+When plugins are loaded or unloaded, or when a menu changes its 
+content, only the menus that changed are processed again. The commands 
+can always be refreshed by clicking on the magnifying glass button. 
+Commands are identified by their menus and label rather than by the 
+object names Maya generates when it builds a menu, so pins and usage 
+are kept.
 
 It is also possible to store your pins and create different pins sets 
 for different tasks, meaning you can create your own custom menu. This 
@@ -36,10 +43,73 @@ This command will set focus to the widget.
 
 ::
     import commandSearch; commandSearch.focus()  
+
+Providers
+=========
+Besides Maya's menubar, the buttons on the shelves and the runtime 
+commands are searchable. Every source is cached separately, so a change 
+in one source only rebuilds the commands of that source. Custom sources 
+can be registered, for example to make studio tools searchable.
+
+::
+    from commandSearch import providers
+    tools = providers.Custom("studioTools", "Studio Tools")
+    tools.add("publish", "Publish Asset", publish, category="Pipeline")
+    providers.register(tools)
+
+Profiling
+=========
+The processing of the menubar, the searching and the populating of the 
+results can be timed. Once enabled, the timings are available per step 
+and can be exported as a Chrome trace.
+
+::
+    import commandSearch
+    commandSearch.trace.enable()
+    commandSearch.stats()
+    commandSearch.trace.export("commandSearch.json")
+
+Engine
+======
+The search engine doesn't depend on Qt or Maya, importing the package 
+doesn't import either until the ui is installed. The engine searches the 
+cached commands, which makes it usable from mayapy, pipeline tools and 
+the command line.
+
+::
+    from commandSearch import engine
+    engine.read().search("poly bevel", limit=10)
+
+::
+    python -m commandSearch "poly bevel" --limit 10
 """
-from .ui import install
-from .hotkey import *
+from .trace import stats
+from . import trace
 
 __author__    = "Robert Joosten"
 __version__   = "2.0.2"
 __email__     = "rwm.joosten@gmail.com"
+
+
+# ----------------------------------------------------------------------------
+
+
+def install():
+    """
+    Add the cmd search functionality to Maya's native status bar. The ui 
+    is only imported when installed, only the search field is created 
+    until it is used.
+    
+    :raises RuntimeError: When the command search is already installed.
+    """
+    from . import ui
+    ui.install()
+    
+def focus():
+    """
+    Set focus to the input search field of the command search widget.
+    
+    :raises ValueError: if command search doesn't exist
+    """
+    from . import hotkey
+    hotkey.focus()
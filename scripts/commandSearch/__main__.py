@@ -0,0 +1,4 @@
+import sys
+from .engine import main
+
+sys.exit(main())
@@ -0,0 +1,146 @@
+import os
+import sys
+import json
+
+# ----------------------------------------------------------------------------
+
+CACHE_NAME = "rjCMDSearchCache.json"
+MENUS_NAME = "rjCMDSearchMenus.json"
+CACHE_VERSION = 4
+
+# ----------------------------------------------------------------------------
+
+def findLocation(name=CACHE_NAME):
+    """
+    The cache gets stored in Maya's user application directory as a json
+    file, this directory is available on all operating systems.
+
+    :param str name: file name
+    :return: Path to cache json file
+    :rtype: str
+    """
+    from maya import cmds
+    path = cmds.internalVar(userAppDir=True)
+    if not path:
+        return
+
+    return os.path.join(path, name)
+
+def findDefaultLocation(name=CACHE_NAME):
+    """
+    Outside of Maya the user application directory is not available, the
+    MAYA_APP_DIR variable is used instead, falling back on Maya's default
+    location of the operating system.
+
+    :param str name: file name
+    :return: Path to cache json file
+    :rtype: str
+    """
+    path = os.environ.get("MAYA_APP_DIR")
+    if not path:
+        home = os.path.expanduser("~")
+        if sys.platform == "win32":
+            path = os.path.join(home, "Documents", "maya")
+        elif sys.platform == "darwin":
+            path = os.path.join(home, "Library", "Preferences", "Autodesk", "maya")
+        else:
+            path = os.path.join(home, "maya")
+
+    return os.path.join(path, name)
+
+def getVersionKey():
+    """
+    Get the key for data that is only influenced by the Maya version.
+
+    :return: Cache key
+    :rtype: dict
+    """
+    from maya import cmds
+    return {
+        "cache": CACHE_VERSION,
+        "version": cmds.about(version=True),
+        "api": cmds.about(apiVersion=True),
+    }
+
+def getKey():
+    """
+    Get the key the cache is stored under, the cache is only valid if the
+    Maya version, ui language and the loaded plugins match, as all of those
+    influence the content of the menu bar.
+
+    :return: Cache key
+    :rtype: dict
+    """
+    from maya import cmds
+    plugins = cmds.pluginInfo(query=True, listPlugins=True) or []
+
+    key = getVersionKey()
+    key["language"] = cmds.about(uiLanguage=True)
+    key["plugins"] = sorted(plugins)
+    return key
+
+# ----------------------------------------------------------------------------
+
+def read(key, name=CACHE_NAME):
+    """
+    Decode the data stored in the cache file, if the key stored in the file
+    doesn't match the provided key or the file cannot be read, None will be
+    returned.
+
+    :param dict key: cache key
+    :param str name: file name
+    :return: Cached data
+    :rtype: dict/None
+    """
+    # get cache path
+    path = findLocation(name)
+    if not path:
+        return
+
+    # read
+    decoded = decode(path)
+
+    # validate key
+    if not decoded or decoded.get("key") != key:
+        return
+
+    return decoded.get("data")
+
+def decode(path):
+    """
+    Decode the cache file without validating its key.
+
+    :param str path:
+    :return: Cache key and data
+    :rtype: dict/None
+    """
+    if not os.path.exists(path):
+        return
+
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (IOError, ValueError):
+        return
+
+def write(key, data, name=CACHE_NAME):
+    """
+    Encode the data and write it to the cache location under the provided
+    key. Failing to write the cache is not critical, so only a message will
+    be printed.
+
+    :param dict key: cache key
+    :param dict data: data to cache
+    :param str name: file name
+    """
+    # get cache path
+    path = findLocation(name)
+    if not path:
+        return
+
+    # write data
+    try:
+        with open(path, "w") as f:
+            json.dump({"key": key, "data": data}, f, separators=(",", ":"))
+    except IOError:
+        print "Search Commands: unable to write cache ( {0} )".format(path)
@@ -1,8 +1,25 @@
-import re
+import time
+from collections import OrderedDict
 from maya import cmds
 
+from . import cache, index, pins, providers, score, trace, tree, usage
+from .engine import Session
 from .ui import utils
 
+# ----------------------------------------------------------------------------
+
+CRAWL_STEP_TIME = 0.02
+CRAWLER = None
+MENUS = {}
+SIGNATURES = {}
+SNAPSHOT = None
+SHARED = False
+
+ACTION_CACHE_SIZE = 64
+ACTIONS = OrderedDict()
+
+# ----------------------------------------------------------------------------
+
 def get():
     """
     Get all registered commands from the global variable, if the global 
@@ -17,81 +34,535 @@ def get():
     
 # ----------------------------------------------------------------------------
 
-def filter(search):
+class Snapshot(object):
+    """
+    Snapshot
+    
+    View of the commands and index at a specific version of the index. A 
+    snapshot can be searched from another thread, as long as the commands 
+    and index it holds are not changed.
+    
+    The menu tree is not part of the snapshot, the hierarchy of a command 
+    is read from the live menu nodes while ranking. Nodes are only changed
+    in the main thread by replacing their title, and commands by replacing
+    their node, so a search that runs while menus are processed can at 
+    worst rank with a mix of old and new titles. Its results are searched 
+    again once the commands are stored.
+    
+    :param dict commands: Commands data
+    :param Index searchIndex: 
+    :param Index/None origin: index the snapshot was copied from
+    """
+    def __init__(self, commands, searchIndex, origin=None):
+        self.commands = commands
+        self.index = searchIndex
+        self.origin = origin
+        self.version = searchIndex.version
+        
+    # ------------------------------------------------------------------------
+    
+    def isCurrent(self):
+        """
+        :return: If the snapshot matches the current index
+        :rtype: bool
+        """
+        return self.origin is INDEX and self.version == INDEX.version
+        
+def snapshot():
+    """
+    Get a snapshot of the commands and index that can be searched from 
+    another thread. The snapshot shares the commands and index, they are 
+    copied once they are changed, so taking a snapshot is cheap.
+    
+    :return: Snapshot
+    :rtype: Snapshot
+    """
+    global SNAPSHOT
+    global SHARED
+    if SNAPSHOT and SNAPSHOT.isCurrent():
+        return SNAPSHOT
+        
+    SHARED = True
+    SNAPSHOT = Snapshot(COMMANDS, INDEX.copy(), INDEX)
+    return SNAPSHOT
+    
+def detach():
+    """
+    Copy the COMMANDS variable before it is changed, if it is shared with 
+    a snapshot.
+    """
+    global COMMANDS
+    global SHARED
+    if SHARED:
+        COMMANDS = dict(COMMANDS)
+        SHARED = False
+    
+# ----------------------------------------------------------------------------
+
+def filter(search, session=None, limit=None, snapshot=None, node=None):
     """
     The search string is processed find matches within the commands variable.
+    The index is used to find the candidates, only those candidates are
+    matched against the search string. If a session is provided, the 
+    results of previous searches in that session will be reused.
+    
+    Pinned commands are always returned first in the order they were 
+    pinned, the other matches are ranked on how well they match the search 
+    string and how often and recently they were used, only the best 
+    matches up to the limit are returned.
+    
+    When a snapshot is provided, it is searched instead of the commands 
+    variable, this makes it possible to filter from another thread. When a 
+    menu node is provided, only the commands in that menu are searched by 
+    walking the menu tree, this search should not be done from another 
+    thread.
     
     :param str search: search string to match with commands
+    :param Session/None session: query session
+    :param int/None limit: maximum amount of ranked matches
+    :param Snapshot/None snapshot: 
+    :param Node/None node: menu node to search within
     :return: Matching commands
     :rtype: list
     """
-    matches = []
-    regexes = []
-    
-    # generate regex
-    if search:
-        for p in search.split():
-            regexes.append(
-                re.compile(
-                    r'.*' + 
-                    re.sub( r'\W', '.*', p.strip() ) + 
-                    r'.*'
-                )    
-            )
-
+    if snapshot is None:
+        snapshot = Snapshot(COMMANDS, INDEX)
+        
+    commands = snapshot.commands
+    
+    # generate tokens
+    with trace.span("filter.parse"):
+        tokens = index.tokenize(search)
+    
     # filter commands
-    for k, v in COMMANDS.iteritems():
-        if v.get("pin"):
-            matches.append(v)
-            continue
-            
-        states = []
-        for regex in regexes:
-            states.append( 
-                re.match(
-                    regex.pattern, 
-                    v.get("search"), 
-                    re.I
-                )
-            )
-            
-        if regexes and None not in states:
-            matches.append(v)
+    with trace.span("filter.match"):
+        if node is not None:
+            keys = set(c.key for c in node.search(tokens)) if tokens else set()
+        elif session:
+            keys = session.search(search, snapshot.index)
+        else:
+            keys = snapshot.index.search(tokens)
+        
+    # get pinned commands
+    state = pins.getState()
+    pinned = [commands[k] for k in list(state.order) if k in commands]
+    
+    # rank matches
+    with trace.span("filter.sort", matches=len(keys)):
+        matches = [commands[k] for k in keys if k not in state]
+        matches = score.rank(tokens, matches, limit, usage.getScore)
 
-    matches.sort(key=lambda x:(-x["pin"], x["hierarchy"]))
-    return matches
+    return pinned + matches
 
 # ----------------------------------------------------------------------------  
 
-def store():  
+def loadMenus():
+    """
+    Read the menu classification from the cache into the MENUS variable, 
+    it is used to only build the dynamic menus when processing the menubar.
+    """
+    global MENUS
+    MENUS = {}
+    
+    data = cache.read(cache.getVersionKey(), cache.MENUS_NAME)
+    if not data:
+        return
+        
+    for k, v in data.iteritems():
+        MENUS[k.encode("utf-8")] = v
+        
+def findKeys(hierarchies):
+    """
+    Find the keys of the commands with the provided hierarchies, the menu 
+    tree is used to find the commands. Hierarchies that cannot be found 
+    are ignored.
+    
+    :param list hierarchies:
+    :return: Command keys
+    :rtype: list
+    """
+    keys = []
+    for hierarchy in hierarchies:
+        if isinstance(hierarchy, unicode):
+            hierarchy = hierarchy.encode("utf-8")
+            
+        # get node
+        titles = hierarchy.split(" > ")
+        node = ROOT.find(titles[:-1])
+        if node is None:
+            continue
+        
+        # get command
+        for command in node.commands:
+            if command.label == titles[-1]:
+                keys.append(command.key)
+                break
+                
+    return keys
+    
+def resolvePins():
+    """
+    Pin the commands of the pending hierarchies of the active pin set. The
+    hierarchies that cannot be found are kept pending, as their commands 
+    might not be stored yet, they are resolved again once the commands 
+    are stored.
+    """
+    state = pins.getState()
+    
+    pending = []
+    for hierarchy in state.pending:
+        keys = findKeys([hierarchy])
+        if keys:
+            state.add(keys[0])
+        else:
+            pending.append(hierarchy)
+            
+    state.pending = pending
+    
+def getRoot():
+    """
+    Get the root node of the menu tree, its children are the menus in the
+    menubar.
+    
+    :return: Root node
+    :rtype: Node
+    """
+    return ROOT
+    
+def reset():
+    """
+    Reset the commands, index, menu tree and menu signature variables and
+    the resolved actions.
+    """
+    global COMMANDS
+    global INDEX
+    global ROOT
+    global SIGNATURES
+    global SHARED
+    SHARED = False
+    COMMANDS = {}
+    INDEX = index.Index()
+    ROOT = tree.Node()
+    SIGNATURES = {}
+    clearActions()
+
+def store(refresh=False, deferred=False):  
     """
     Process Maya's menubar to see if any if its children meet the search 
     command requirements. If so, the button and commands will be added 
-    to the commands variable.
+    to the commands variable and their search strings to the index.
+    
+    The processed commands are written to a cache, keyed by the Maya 
+    version, ui language and loaded plugins. As long as the key matches, 
+    the commands are loaded from the cache rather than processing the 
+    menubar, unless a refresh is forced. The commands of the registered
+    providers are stored by the crawler before the menubar is processed, 
+    each from its own cache.
+    
+    While processing the menubar, menus are classified as static or dynamic
+    depending on whether their content changes when they are built. The 
+    classification is cached, so following runs only build dynamic menus.
+    
+    When deferred, the providers and menubar are processed in small steps
+    over multiple iterations of the event loop, the running crawler is 
+    returned so its progress can be followed. The commands and index are 
+    searchable while the crawler is running.
+    
+    :param bool refresh: ignore the cache and process the menubar
+    :param bool deferred: process the menubar without blocking the ui
+    :return: Running crawler, None if not deferred
+    :rtype: Crawler/None
     """
+    global CRAWLER
+    
+    # cancel running crawler
+    if CRAWLER:
+        CRAWLER.cancel()
+        CRAWLER = None
+    
     # reset commands
-    global COMMANDS
-    COMMANDS = {}
+    reset()
+    loadMenus()
     
-    # loop menu bar
-    menuBar = utils.mayaMenu()
-    _store(menuBar)
+    # read cache
+    key = cache.getKey()
+    data = None if refresh else cache.read(key)
     
-    print "Search Commands: {0} buttons registered".format(len(COMMANDS))
+    stack = None
+    if data is not None:
+        with trace.span("store.load"):
+            load(data)
+            
+        storeSignatures()
+        print "Search Commands: {0} buttons loaded from cache".format(
+            len(data)
+        )
+        stack = []
+        
+    # loop providers and menu bar
+    crawler = Crawler(
+        key, 
+        stack=stack, 
+        providers=providers.getProviders(), 
+        refresh=refresh
+    )
+    if not deferred:
+        with trace.span("store"):
+            crawler.run()
+        return
+        
+    CRAWLER = crawler
+    CRAWLER.start()
+    return CRAWLER
 
-def _store(parent, parents=[]):
+def storeProvider(provider, refresh=False):
+    """
+    Store the commands of the provider, replacing its previously stored 
+    commands. The commands are loaded from the cache of the provider as 
+    long as its key matches, otherwise they are collected and cached. 
+    Failing to collect the commands of a provider is not critical, so only 
+    a message will be printed.
+    
+    :param Provider provider:
+    :param bool refresh: ignore the cache and collect the commands
+    """
+    # read cache
+    data = None
+    key = None
+    if provider.cached:
+        key = provider.getKey()
+        name = provider.getCacheName()
+        data = None if refresh else cache.read(key, name)
+    
+    # collect
+    if data is None:
+        try:
+            with trace.span("storeProvider/" + provider.name):
+                data = provider.collect()
+        except RuntimeError as e:
+            print "Search Commands: unable to collect {0} ( {1} )".format(
+                provider.title, 
+                e
+            )
+            return
+            
+        if provider.cached:
+            cache.write(key, data, name)
+    
+    # replace commands
+    removeProvider(provider)
+    load(data, provider)
+    provider.key = key
+    
+def removeProvider(provider):
+    """
+    Remove the commands of the provider from the COMMANDS variable, the 
+    index and the menu tree.
+    
+    :param Provider provider:
+    """
+    for key, command in COMMANDS.items():
+        if command.provider == provider.name:
+            removeItem(key)
+
+def update(deferred=False):
+    """
+    Update the stored commands after the menubar or the sources of the 
+    providers changed, for example when a plugin is loaded or unloaded. 
+    Only the providers of which the key changed are stored again. Of the 
+    menubar, the commands of menus that no longer exist are removed and 
+    only the menus of which the content changed are processed again.
+    
+    :param bool deferred: process the menus without blocking the ui
+    :return: Running crawler, None if nothing changed or not deferred
+    :rtype: Crawler/None
+    """
+    if not get() or (CRAWLER and CRAWLER.isRunning()):
+        return
+        
+    # get changed providers
+    changed = [
+        provider 
+        for provider in providers.getProviders()
+        if provider.cached and provider.getKey() != provider.key
+    ]
+    
+    # get menus
+    menus = {}
+    for menu in utils.mayaMenu().findChildren(utils.QMenu):
+        name = menu.objectName().encode("utf-8")
+        if name:
+            menus[name] = menu
+    
+    # update menus
+    removeMenus(set(menus.keys()))
+    return updateMenus(menus.values(), deferred, changed)
+    
+def updateMenus(menus, deferred=False, changed=None):
+    """
+    Process the menus of which the content changed since they were last 
+    processed, together with the changed providers. The processed commands
+    are compared by key to the commands stored for the menus, unchanged 
+    commands are left untouched and commands that no longer exist are 
+    removed. Pins and usage are stored by key, which doesn't change when 
+    a menu is rebuilt, so they are unaffected. The resolved actions are 
+    cleared, as they might have been deleted when the menus were rebuilt.
+    
+    :param list menus: QMenu list
+    :param bool deferred: process the menus without blocking the ui
+    :param list/None changed: providers to store again
+    :return: Running crawler, None if nothing changed or not deferred
+    :rtype: Crawler/None
+    """
+    global CRAWLER
+    
+    clearActions()
+    
+    # get changed menus
+    menusChanged = {}
+    for menu in menus:
+        name = menu.objectName().encode("utf-8")
+        if SIGNATURES.get(name) != getMenuHash(menu):
+            menusChanged[name] = menu
+            
+    # get menus to process, nested menus are processed with their parent
+    stack = []
+    for name, menu in menusChanged.iteritems():
+        parent = menu.parent()
+        while type(parent) == utils.QMenu:
+            if parent.objectName().encode("utf-8") in menusChanged:
+                break
+            parent = parent.parent()
+        else:
+            node = findNode(menu)
+            if node is None:
+                continue
+                
+            SIGNATURES[name] = getMenuHash(menu)
+            stack.append((menu, node, node.path()[0].title))
+            
+    if not stack and not changed:
+        return
+        
+    # process menus
+    crawler = Crawler(cache.getKey(), stack=stack, providers=changed)
+    if not deferred:
+        crawler.run()
+        return
+        
+    if CRAWLER:
+        CRAWLER.cancel()
+        
+    CRAWLER = crawler
+    CRAWLER.start()
+    return CRAWLER
+    
+def removeMenus(names):
+    """
+    Remove the menu nodes of the menubar that are not in the provided 
+    object names, together with their commands.
+    
+    :param set names: object names of the existing menus
+    """
+    ignore = set(provider.name for provider in providers.getProviders())
+    
+    nodes = [n for n in ROOT.children.values() if n.name not in ignore]
+    while nodes:
+        node = nodes.pop()
+        if node.name in names:
+            nodes.extend(node.children.values())
+            continue
+            
+        for command in list(node.walk()):
+            removeItem(command.key)
+            
+        del node.parent.children[node.name]
+        
+def findNode(menu):
+    """
+    Get the node of a menu in the menu tree, nodes that don't exist yet 
+    are created.
+    
+    :param QMenu menu:
+    :return: Node, None if the menu is not in the menubar
+    :rtype: Node/None
+    """
+    # get parent menus
+    menus = []
+    widget = menu
+    while type(widget) == utils.QMenu:
+        menus.append(widget)
+        widget = widget.parent()
+        
+    if type(widget) != utils.QMenuBar:
+        return
+        
+    # get node
+    node = ROOT
+    for menu in reversed(menus):
+        name = menu.objectName().encode("utf-8")
+        if not name:
+            return
+            
+        node = addNode(node, menu.title().encode("utf-8"), name)
+        
+    return node
+    
+def addNode(node, title, name):
+    """
+    Get the child menu node with the provided object name, if it doesn't 
+    exist it will be created. The search strings of commands include the
+    titles of their menus, so if the title of an existing menu changed, 
+    the commands below it are added to the index again.
+    
+    :param Node node: parent menu node
+    :param str title: title of the menu
+    :param str name: object name of the menu
+    :return: Child node
+    :rtype: Node
+    """
+    child = node.children.get(name)
+    renamed = child is not None and child.title != title
+    
+    child = node.add(title, name)
+    if renamed:
+        for command in child.walk():
+            INDEX.add(command.key, command.search)
+            
+    return child
+    
+def storeSignatures():
+    """
+    Store the signatures of all menus in the menubar, they are used to see
+    which menus changed when updating the commands.
+    """
+    for menu in utils.mayaMenu().findChildren(utils.QMenu):
+        name = menu.objectName().encode("utf-8")
+        if name:
+            SIGNATURES[name] = getMenuHash(menu)
+
+def _store(parent, node, stored=None):
     """
     Process the parent to see if any if its children meet the search 
     command requirements. If so, the button and commands will be added 
-    to the commands variable.
+    to the commands variable. The children are not processed recursively,
+    instead they are returned together with their menu node so they can be
+    processed next. Menus are not built here, they are built once they are
+    processed.
     
     :param QWidget parent: direct parent
-    :param list parents: linked menu's
+    :param Node node: menu node of the parent
+    :param set/None stored: set the keys of the stored commands are added to
+    :return: Children and their menu nodes
+    :rtype: list
     """
-    children = parent.children()
-    for i, item in enumerate(children):
+    children = []
+    counts = {}
+    previous = None
+    for i, item in enumerate(parent.children()):
         # tree
-        tree = parents[:]
+        child = node
+        key = None
     
         # get items
         name = item.objectName().encode("utf-8")
@@ -102,9 +573,7 @@ def _store(parent, parents=[]):
             
         # process menu
         if type(item) == utils.QMenu:
-            tree.append(
-                getMenu(item)
-            )
+            child = addNode(node, item.title().encode("utf-8"), name)
             
         # process item
         elif type(item) == utils.QWidgetAction:  
@@ -113,71 +582,773 @@ def _store(parent, parents=[]):
             
             if not "isOptionBox" in dynamic:
                 # main item
-                getItem(item, name, tree)
+                key = getItem(item, name, node, counts)
             else:
                 # option box item
-                getItemOptionBox(item, parent)
+                getItemOptionBox(item, previous)
+                
+        if key and stored is not None:
+            stored.add(key)
             
         # store as parent
-        parent = name   
+        previous = key
         
         # process next
-        _store(item, tree)
+        children.append((item, child))
+        
+    return children
+        
+# ----------------------------------------------------------------------------
+
+class Crawler(utils.QObject):
+    """
+    Crawler
+    
+    Processes the providers and Maya's menubar in steps, every step stores
+    a provider or builds menus and processes the children of widgets until
+    the step time is exceeded. Providers are stored before the menubar is 
+    processed, one provider per step, as collecting a provider can take a 
+    while. A 
+    menu is only built once it is taken from the stack, so a step never 
+    builds more menus than fit in its time. When started, a step is 
+    processed every iteration of the event loop, keeping the ui 
+    responsive. Once finished, the commands are written to 
+    the cache under the provided key. Every widget on the stack remembers
+    the top most menu it is in, so the time spent can be traced per top 
+    most menu.
+    
+    When a stack of menus is provided, only those menus are processed. The
+    commands previously stored in those menus that are not processed again
+    are removed once finished. When the stack is empty, only the providers
+    are stored and the menubar cache is left untouched.
+    
+    :param dict key: cache key
+    :param float budget: time in seconds to process per step
+    :param list/None stack: menus with their node and top most menu title
+    :param list/None providers: providers to store
+    :param bool refresh: ignore the cache of the providers
+    """
+    progress = utils.Signal(int)
+    finished = utils.Signal()
+    def __init__(
+        self, 
+        key, 
+        budget=CRAWL_STEP_TIME, 
+        stack=None, 
+        providers=None, 
+        refresh=False
+    ):
+        utils.QObject.__init__(self)
+        
+        # variable
+        self.key = key
+        self.budget = budget
+        self.count = 0
+        self.providers = list(providers or [])
+        self.refresh = refresh
+        self.menus = stack is None or bool(stack)
+        self.stack = [(utils.mayaMenu(), ROOT, "")] if stack is None else stack
+        
+        # get previous commands
+        self.nodes = None
+        self.seen = None
+        self.previous = None
+        if stack:
+            self.nodes = [node for _, node, _ in stack]
+            self.seen = set()
+            self.previous = set(
+                command.key 
+                for _, node, _ in stack
+                for command in node.walk() 
+                if not command.provider
+            )
+        
+        # create timer
+        self.timer = utils.QTimer(self)
+        self.timer.setInterval(0)
+        self.timer.timeout.connect(self.step)
+        
+    # ------------------------------------------------------------------------
+    
+    def isRunning(self):
+        return self.timer.isActive()
+        
+    def isFinished(self):
+        return not self.stack and not self.providers
+        
+    # ------------------------------------------------------------------------
+    
+    def start(self):
+        """
+        Start processing a step every iteration of the event loop.
+        """
+        self.timer.start()
+        
+    def run(self):
+        """
+        Process all steps without returning to the event loop.
+        """
+        while not self.isFinished():
+            self.step()
+        
+    def cancel(self):
+        """
+        Stop processing, the commands processed so far remain searchable but
+        will not be written to the cache.
+        """
+        self.timer.stop()
+        self.providers = []
+        self.stack = []
+        
+    # ------------------------------------------------------------------------
+        
+    def step(self):
+        """
+        Store the providers and process the widgets on the stack until the 
+        step time is exceeded, at least one provider or widget is processed 
+        every step. A provider is always stored in its own step. Menus are 
+        built before their children are processed. Children are added to the
+        stack in reverse, so the menubar is processed in the same order as 
+        it would be recursively.
+        """
+        processed = 0
+        start = time.time()
+        while self.providers or self.stack:
+            if processed and (
+                self.providers or time.time() - start > self.budget
+            ):
+                break
+                
+            if self.providers:
+                storeProvider(self.providers.pop(0), self.refresh)
+                processed += 1
+                continue
+                
+            parent, node, top = self.stack.pop()
+            with trace.span("_store/" + top):
+                if type(parent) == utils.QMenu:
+                    getMenu(parent)
+                    
+                children = _store(parent, node, self.seen)
+                
+            self.stack.extend(
+                (item, child, top or child.title) 
+                for item, child in reversed(children)
+            )
+            processed += len(children) or 1
+        
+        self.count += processed
+        self.progress.emit(self.count)
+        
+        if self.isFinished():
+            self.finish()
+            
+    def finish(self):
+        """
+        Remove the previous commands that were not processed again, and the
+        menus left without commands, and write the processed commands and 
+        menu classification to the cache. The classification is merged into
+        the cached classification, as an incremental crawler only processes
+        some of the menus. Nothing is written if no menus were processed.
+        """
+        self.timer.stop()
+        if not self.menus:
+            self.finished.emit()
+            return
+            
+        if self.previous is not None:
+            for key in self.previous - self.seen:
+                removeItem(key)
+                
+            for node in self.nodes:
+                node.prune()
+                
+        with trace.span("store.write"):
+            cache.write(self.key, dump())
+            versionKey = cache.getVersionKey()
+            menus = cache.read(versionKey, cache.MENUS_NAME) or {}
+            menus.update(MENUS)
+            cache.write(versionKey, menus, cache.MENUS_NAME)
+        
+        print "Search Commands: {0} buttons registered".format(
+            len([c for c in COMMANDS.itervalues() if not c.provider])
+        )
+        self.finished.emit()
         
 # ----------------------------------------------------------------------------  
           
 def getMenu(menu):
     """
-    Get the name of the QMenu parsed.
+    Get the name of the QMenu parsed. The menu is built by emitting its 
+    about to show signal, unless it is known to be static and already 
+    contains actions. The classification of the menu is stored, once 
+    dynamic a menu stays dynamic.
     
     :param QMenu menu:
     :return: Menu name
     :rtype: str
     """
     name = menu.title().encode("utf-8")
-    menu.aboutToShow.emit()
+    key = menu.objectName().encode("utf-8")
+    
+    info = MENUS.get(key)
+    if info and not info.get("dynamic") and menu.actions():
+        SIGNATURES[key] = getMenuHash(menu)
+        return name
+    
+    # build menu
+    dynamic, signature, duration = buildMenu(menu, info)
+    
+    # store classification
+    dynamic = dynamic or bool(info and info.get("dynamic"))
+    MENUS[key] = {"title": name, "dynamic": dynamic, "time": duration}
+    SIGNATURES[key] = hash(tuple(signature))
+    
     return name
     
+def buildMenu(menu, info=None):
+    """
+    Build the menu by emitting its about to show signal and classify it. 
+    A menu is dynamic if its content changes when it is built again. Many 
+    menus are empty until they are built for the first time, such a menu 
+    is built a second time to see if its content changes again, rather 
+    than classifying it as dynamic because it was populated once. A menu 
+    that is already classified is only built once.
+    
+    :param QMenu menu:
+    :param dict/None info: stored classification of the menu
+    :return: If the menu is dynamic, its signature and the build duration
+    :rtype: tuple
+    """
+    name = menu.title().encode("utf-8")
+    
+    # build menu
+    before = getMenuSignature(menu)
+    t = time.time()
+    with trace.span("getMenu.aboutToShow", menu=name):
+        menu.aboutToShow.emit()
+    duration = time.time() - t
+    after = getMenuSignature(menu)
+    
+    # build menu again, if it was populated for the first time
+    if info is None and not before and after:
+        before = after
+        with trace.span("getMenu.aboutToShow", menu=name):
+            menu.aboutToShow.emit()
+        after = getMenuSignature(menu)
+        
+    return bool(before) and before != after, after, duration
+    
+def getMenuSignature(menu):
+    """
+    Get the object names and text of all actions in the menu, comparing 
+    the signature before and after the menu is built shows if the menu is
+    dynamic.
+    
+    :param QMenu menu:
+    :return: Menu signature
+    :rtype: list
+    """
+    return [(a.objectName(), a.text()) for a in menu.actions()]
+    
+def getMenuHash(menu):
+    """
+    :param QMenu menu:
+    :return: Hash of the menu signature
+    :rtype: int
+    """
+    return hash(tuple(getMenuSignature(menu)))
+    
+def getMenuTimings():
+    """
+    Get the classification and build time of all menus that were built 
+    while processing the menubar, sorted from slowest to fastest.
+    
+    :return: Menu object names and their info
+    :rtype: list
+    """
+    return sorted(
+        MENUS.iteritems(), 
+        key=lambda x:x[1].get("time"), 
+        reverse=True
+    )
+    
 # ----------------------------------------------------------------------------
     
-def getItem(item, name, parents):
+def getKey(node, label):
     """
-    Get data from item and store it into COMMANDS variable.
+    Get the key of a menubar command. Maya generates the object names of 
+    the menu items and nested menus of dynamic menus every time they are
+    built, so the key is built from the object name of the top most menu,
+    the titles of the nested menus and the label. This way the key stays 
+    the same when a menu is rebuilt, and so do the pins and usage that are 
+    stored by key.
+    
+    :param Node node: menu node the command is in
+    :param str label:
+    :return: Command key
+    :rtype: str
+    """
+    path = node.path()
+    parts = [path[0].name] + [n.title for n in path[1:]] if path else []
+    return "|".join(parts + [label])
+    
+def getItem(item, name, node, counts):
+    """
+    Get data from item and store it into COMMANDS variable. Menu items 
+    with the same label in the same menu are numbered in order.
     
     :param QWidgetAction item:
     :param str name: 
-    :param list parents: List f all parents, used for hierarchy
+    :param Node node: menu node the item is in
+    :param dict counts: amount of menu items per key in the menu
+    :return: Command key
+    :rtype: str/None
     """
 
     # get name
     text = item.text().encode("utf-8")
     if not name or item.isSeparator() or item.menu():  
         return
-    
-    # add last parent
-    parents.append(text)
         
-    # get icon
-    icon = cmds.menuItem(utils.qtToMaya(item), query=True, image=True)
+    # get key
+    key = getKey(node, text)
+    count = counts.get(key, 0)
+    counts[key] = count + 1
+    if count:
+        key = "{0}#{1}".format(key, count)
       
-    # store commands      
-    COMMANDS[name] = dict( )
-    COMMANDS[name]["name"] = text
-    COMMANDS[name]["pin"] = False
-    COMMANDS[name]["cmd"] = item 
-    COMMANDS[name]["icon"] = utils.QIcon( ":/{0}".format(icon))
-    COMMANDS[name]["group"] = parents[0]
-    COMMANDS[name]["search"] = "".join([p.lower() for p in parents]) 
-    COMMANDS[name]["hierarchy"] = " > ".join(parents)
+    # store commands, the icon is queried when the command is displayed
+    action = Action(name, node, text, utils.qtToMaya(item))
+    addItem(key, node, text, None, action)
+    return key
+      
+def getItemImage(item):
+    """
+    Query the icon of a menu item from Maya. The action is looked up in 
+    the menubar, as its Maya path might point to another menu item after 
+    its menu was rebuilt, but its menus are not built to find it.
+    
+    :param Action/object item:
+    :return: Name of the icon
+    :rtype: str
+    """
+    if not isinstance(item, Action):
+        return ""
+        
+    action = item.find()
+    path = action and utils.qtToMaya(action)
+    if not path:
+        return ""
+        
+    try:
+        image = cmds.menuItem(path, query=True, image=True)
+    except RuntimeError:
+        return ""
+        
+    return image or ""
       
-def getItemOptionBox(item, name):
+def getItemOptionBox(item, key):
     """
     Get data from option item and store it into COMMANDS variable.
     
     :param QWidgetAction item:
+    :param str/None key: key of the command before the option box
+    """
+    if not key in COMMANDS:
+        return
+
+    COMMANDS[key].cmdOption = Action(
+        item.objectName().encode("utf-8"), 
+        COMMANDS[key].node,
+        COMMANDS[key].label,
+        utils.qtToMaya(item),
+        option=True
+    )
+    
+class Command(object):
+    """
+    Command
+    
+    Compact record of a command. The command points to the node of the 
+    menu it is in, the hierarchy and search strings are derived from the 
+    menu tree when needed rather than stored. The icon of a menu item is 
+    only queried from Maya once the command is displayed.
+    
+    :param str key: 
+    :param Node node: menu node the command is in
+    :param str label: 
+    :param str/None image: Name of the icon, None if not queried yet
+    :param Action/object cmd:
+    :param str/None provider: name of the provider, None for the menubar
+    """
+    __slots__ = (
+        "key", "node", "label", "image", "cmd", "cmdOption", "provider"
+    )
+    def __init__(self, key, node, label, image, cmd, provider=None):
+        self.key = key
+        self.node = node
+        self.label = label
+        self.image = image
+        self.cmd = cmd
+        self.cmdOption = None
+        self.provider = provider
+        
+    # ------------------------------------------------------------------------
+    
+    def getImage(self):
+        """
+        :return: Name of the icon, queried from Maya the first time
+        :rtype: str
+        """
+        if self.image is None:
+            self.image = getItemImage(self.cmd)
+            
+        return self.image
+        
+    # ------------------------------------------------------------------------
+    
+    @property
+    def pin(self):
+        return self.key in pins.getState()
+        
+    @pin.setter
+    def pin(self, state):
+        if state:
+            pins.getState().add(self.key)
+        else:
+            pins.getState().remove(self.key)
+            
+    @property
+    def parents(self):
+        return self.node.titles() + [self.label]
+        
+    @property
+    def name(self):
+        return self.label
+        
+    @property
+    def group(self):
+        path = self.node.path()
+        return path[0].title if path else self.label
+        
+    @property
+    def search(self):
+        return "".join([p.lower() for p in self.parents])
+        
+    @property
+    def hierarchy(self):
+        return " > ".join(self.parents)
+    
+def addItem(name, node, label, image, cmd, provider=None):
+    """
+    Store the command into the COMMANDS variable and the menu node. If an
+    identical command is already stored, only its action is updated, so 
+    the index is left untouched.
+    
     :param str name: 
+    :param Node node: menu node the command is in
+    :param str label:
+    :param str/None image: Name of the icon, None if not queried yet
+    :param Action/object cmd:
+    :param str/None provider: name of the provider, None for the menubar
     """
-    if not name in COMMANDS.keys():
+    previous = COMMANDS.get(name)
+    if previous:
+        # keep unchanged commands
+        if (
+            previous.node is node and 
+            previous.label == label and 
+            (image is None or previous.image == image) and
+            previous.provider == provider
+        ):
+            previous.cmd = cmd
+            return
+            
+        previous.node.commands.remove(previous)
+        
+    detach()
+    COMMANDS[name] = Command(name, node, label, image, cmd, provider)
+    node.commands.append(COMMANDS[name])
+    INDEX.add(name, COMMANDS[name].search)
+    
+def removeItem(name):
+    """
+    Remove the command from the COMMANDS variable, the index and its menu
+    node.
+    
+    :param str name:
+    """
+    if name not in COMMANDS:
         return
+        
+    detach()
+    command = COMMANDS.pop(name)
+        
+    command.node.commands.remove(command)
+    INDEX.remove(name)
+    
+# ----------------------------------------------------------------------------
+
+def dump():
+    """
+    Get the data of the menubar commands in the COMMANDS variable in a 
+    format that can be written to the cache, the actions are replaced with
+    their object names and Maya paths and the menu nodes with the object 
+    names and titles of the menus.
+    
+    :return: Commands data
+    :rtype: dict
+    """
+    data = {}
+    for k, v in COMMANDS.iteritems():
+        if v.provider:
+            continue
+            
+        option = v.cmdOption
+            
+        data[k] = dict( )
+        data[k]["menus"] = [[n.name, n.title] for n in v.node.path()]
+        data[k]["label"] = v.label
+        data[k]["image"] = v.image
+        data[k]["name"] = v.cmd.name
+        data[k]["path"] = v.cmd.path
+        data[k]["option"] = option.name if option else None
+        data[k]["optionPath"] = option.path if option else None
+        
+    return data
+    
+def load(data, provider=None):
+    """
+    Store the cached data into the COMMANDS variable and rebuild the menu
+    tree, the actions are resolved when they are triggered. The commands 
+    of a provider are created by the provider, their keys are prefixed with
+    the name of the provider.
+    
+    :param dict data: Commands data as returned by dump or a provider
+    :param Provider/None provider:
+    """
+    for k, v in data.iteritems():
+        name = k.encode("utf-8")
+        label = v["label"].encode("utf-8")
+        
+        # get node
+        node = ROOT
+        for menu, title in v["menus"]:
+            node = addNode(node, title.encode("utf-8"), menu.encode("utf-8"))
+        
+        # store provider command
+        if provider:
+            key = "{0}:{1}".format(provider.name, name)
+            cmd = provider.getCommand(name, v)
+            addItem(key, node, label, v["image"], cmd, provider.name)
+            COMMANDS[key].cmdOption = provider.getOption(name, v)
+            continue
+        
+        # store command
+        action = Action(v["name"].encode("utf-8"), node, label, v.get("path"))
+        addItem(name, node, label, v["image"], action)
+        
+        option = v.get("option")
+        if option:
+            COMMANDS[name].cmdOption = Action(
+                option.encode("utf-8"), 
+                node, 
+                label,
+                v.get("optionPath"),
+                option=True
+            )
+            
+# ----------------------------------------------------------------------------
+
+class Action(object):
+    """
+    Action
+    
+    Handle of a menu item. Rather than holding on to the QWidgetAction, 
+    which Maya deletes when a dynamic menu is rebuilt, the handle stores 
+    the object name, label and Maya path of the menu item and the menu 
+    node it is in. Object names and Maya paths are reused when a dynamic 
+    menu is rebuilt, so they are only used as a hint, the action is only 
+    accepted if its label matches. Option boxes have no label of their 
+    own, they are matched by the label of the menu item before them.
+    
+    The action is resolved through a small cache of live actions, keyed 
+    by Maya path, when it is triggered. If it cannot be found, the menus 
+    it is nested in are built before trying again, if it still cannot be 
+    found the command of the menu item is executed through Maya.
+    
+    :param str name: object name of the action
+    :param Node node: menu node the action is in
+    :param str label: label of the menu item
+    :param str/None path: Maya path of the menu item
+    :param bool option: if the action is an option box
+    """
+    __slots__ = ("name", "node", "label", "path", "option")
+    def __init__(self, name, node, label, path=None, option=False):
+        self.name = name
+        self.node = node
+        self.label = label
+        self.path = path
+        self.option = option
+        
+    # ------------------------------------------------------------------------
+    
+    def find(self):
+        """
+        Find the action in the cache or through its Maya path, without 
+        building any menus. If the action found doesn't match the label, 
+        the menu of the action is searched by label instead.
+        
+        :return: Action
+        :rtype: QAction/None
+        """
+        key = self.path or self.name
+        action = ACTIONS.pop(key, None)
+        if action is None or not utils.shiboken.isValid(action):
+            action = self.path and utils.mayaToQTAction(self.path)
+            
+        action = action and self.match(action)
+        action = action or self.findByLabel()
+        if action is None:
+            return
+                
+        ACTIONS[key] = action
+        if len(ACTIONS) > ACTION_CACHE_SIZE:
+            ACTIONS.popitem(last=False)
+            
+        return action
+        
+    def match(self, action):
+        """
+        :param QAction action:
+        :return: Action if it matches the label, for option boxes the
+            option box that matches in the menu of the action
+        :rtype: QAction/None
+        """
+        if self.option:
+            return self.findInMenu(action.parentWidget())
+        
+        if action.text().encode("utf-8") == self.label:
+            return action
+        
+    def findInMenu(self, menu):
+        """
+        :param QWidget/None menu:
+        :return: Action with the label in the menu
+        :rtype: QAction/None
+        """
+        if menu is None:
+            return
+        
+        matched = False
+        for action in menu.actions():
+            if matched:
+                if action.property("isOptionBox"):
+                    return action
+                return
+                
+            if action.property("isOptionBox"):
+                continue
+                
+            if action.text().encode("utf-8") == self.label:
+                if not self.option:
+                    return action
+                matched = True
+        
+    def findByLabel(self):
+        """
+        :return: Action with the label in the menu of the action
+        :rtype: QAction/None
+        """
+        if not self.node.name:
+            return
+            
+        menu = utils.mayaMenu().findChild(utils.QMenu, self.node.name)
+        return self.findInMenu(menu)
+    
+    def resolve(self):
+        """
+        :return: Action
+        :rtype: QAction/None
+        """
+        action = self.find()
+        if action:
+            return action
+            
+        # build menus
+        menuBar = utils.mayaMenu()
+        for name in self.node.names():
+            menu = menuBar.findChild(utils.QMenu, name)
+            if menu:
+                menu.aboutToShow.emit()
+                
+        return self.find()
+        
+    def exists(self):
+        """
+        :return: If the Maya path exists and holds the menu item with the 
+            label, for option boxes the menu item before it
+        :rtype: bool
+        """
+        if not self.path or not cmds.menuItem(self.path, exists=True):
+            return False
+            
+        path = self.path
+        if self.option:
+            parent, name = path.rsplit("|", 1)
+            items = cmds.menu(parent, query=True, itemArray=True) or []
+            if name not in items or not items.index(name):
+                return False
+                
+            path = "{0}|{1}".format(parent, items[items.index(name) - 1])
+            
+        label = cmds.menuItem(path, query=True, label=True) or ""
+        return label.encode("utf-8") == self.label
+        
+    def execute(self):
+        """
+        Execute the command of the menu item through Maya.
+        
+        :raises RuntimeError: if the menu item cannot be found
+        """
+        if not self.exists():
+            raise RuntimeError(
+                "Search Commands: unable to find {0}".format(self.label)
+            )
+            
+        command = cmds.menuItem(self.path, query=True, command=True)
+        if callable(command):
+            command()
+            return
+            
+        if command:
+            sourceType = cmds.menuItem(self.path, query=True, sourceType=True)
+            providers.Script(command, sourceType or "mel").trigger()
+        
+    def trigger(self):
+        """
+        Resolve the action and trigger it, if it cannot be resolved the 
+        command of the menu item is executed through Maya.
+        
+        :raises RuntimeError: if the menu item cannot be found
+        """
+        action = self.resolve()
+        if action:
+            action.trigger()
+            return
+            
+        self.execute()
+        
+def clearActions():
+    """
+    Remove all resolved actions from the cache, they are resolved again the
+    next time they are triggered.
+    """
+    ACTIONS.clear()
+    
+# ----------------------------------------------------------------------------
 
-    COMMANDS[name]["cmdOption"]   = item
+# the variables exist before the commands are stored, so pin sets can be 
+# activated before the first search
+reset()
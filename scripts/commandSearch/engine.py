@@ -0,0 +1,286 @@
+"""
+Search engine of the command search that doesn't depend on Qt or Maya, it
+can be used from mayapy, pipeline tools and tests. The engine loads the
+commands from the cache written by Maya and returns ranked command
+descriptors.
+
+::
+    from commandSearch import engine
+    e = engine.read()
+    for descriptor in e.search("poly bevel", limit=10):
+        print descriptor.hierarchy
+
+It can also be used from the command line:
+
+::
+    python -m commandSearch "poly bevel" --limit 10
+"""
+import sys
+import json
+import argparse
+
+from . import cache, index, score
+
+# ----------------------------------------------------------------------------
+
+class Session(object):
+    """
+    Session
+
+    A query session keeps track of the results of the previous searches. 
+    When a search string extends the previous one, it can only narrow down 
+    the results, so only the previous results are matched. When characters 
+    are removed, the results of the matching ancestor search are reused.
+    """
+    def __init__(self):
+        self.index = None
+        self.version = None
+        self.history = []
+        
+    # ------------------------------------------------------------------------
+    
+    def clear(self):
+        self.index = None
+        self.version = None
+        self.history = []
+        
+    def search(self, search, searchIndex):
+        """
+        Get the keys of all commands that match the search string, 
+        previous results are reused where possible.
+        
+        :param str search: search string to match with commands
+        :param Index searchIndex: 
+        :return: Matching keys
+        :rtype: set
+        """
+        # validate index
+        if self.index is not searchIndex or self.version != searchIndex.version:
+            self.clear()
+            self.index = searchIndex
+            self.version = searchIndex.version
+            
+        search = search or ""
+        
+        # remove searches that are not an ancestor
+        while self.history and not search.startswith(self.history[-1][0]):
+            self.history.pop()
+            
+        # reuse matching search
+        if self.history and self.history[-1][0] == search:
+            return self.history[-1][1]
+            
+        # generate tokens
+        tokens = index.tokenize(search)
+        if not tokens:
+            return set()
+            
+        # narrow down ancestor
+        keys = None
+        if self.history:
+            keys = self.history[-1][1]
+            
+        matches = searchIndex.search(tokens, keys)
+        self.history.append((search, matches))
+        return matches
+
+# ----------------------------------------------------------------------------
+
+class Descriptor(object):
+    """
+    Descriptor
+
+    Description of a command loaded from the cache, it holds everything
+    needed to display and rank the command but not the command itself.
+
+    :param str key:
+    :param str label:
+    :param str image: Name of the icon
+    :param list menus: object names and titles of the menus the command is
+        in, starting at the menubar
+    :param str/None option: object name of the option box
+    """
+    __slots__ = ("key", "label", "image", "menus", "option")
+    def __init__(self, key, label, image, menus, option=None):
+        self.key = key
+        self.label = label
+        self.image = image
+        self.menus = menus
+        self.option = option
+
+    # ------------------------------------------------------------------------
+
+    @property
+    def parents(self):
+        return [title for _, title in self.menus] + [self.label]
+
+    @property
+    def name(self):
+        return self.label
+
+    @property
+    def group(self):
+        return self.menus[0][1] if self.menus else self.label
+
+    @property
+    def search(self):
+        return "".join([p.lower() for p in self.parents])
+
+    @property
+    def hierarchy(self):
+        return " > ".join(self.parents)
+
+    # ------------------------------------------------------------------------
+
+    def asDict(self):
+        """
+        :return: Descriptor data
+        :rtype: dict
+        """
+        return {
+            "key": self.key,
+            "label": self.label,
+            "image": self.image,
+            "menus": self.menus,
+            "option": self.option,
+            "hierarchy": self.hierarchy,
+        }
+
+# ----------------------------------------------------------------------------
+
+class Engine(object):
+    """
+    Engine
+
+    Holds the command descriptors and their index. Searches are done in a
+    query session, so typing a search string one character at a time only
+    narrows down the previous results.
+    """
+    def __init__(self):
+        self.commands = {}
+        self.index = index.Index()
+        self.session = Session()
+
+    # ------------------------------------------------------------------------
+
+    def __len__(self):
+        return len(self.commands)
+
+    def __contains__(self, key):
+        return key in self.commands
+
+    # ------------------------------------------------------------------------
+
+    def load(self, data):
+        """
+        Add the commands of the cached data to the engine.
+
+        :param dict data: Commands data as written to the cache
+        """
+        for k, v in data.iteritems():
+            name = k.encode("utf-8")
+            menus = [
+                [menu.encode("utf-8"), title.encode("utf-8")]
+                for menu, title in v["menus"]
+            ]
+            option = v.get("option")
+            if option:
+                option = option.encode("utf-8")
+
+            descriptor = Descriptor(
+                name,
+                v["label"].encode("utf-8"),
+                v["image"],
+                menus,
+                option
+            )
+            self.commands[name] = descriptor
+            self.index.add(name, descriptor.search)
+
+    def search(self, search, limit=None, frecency=None):
+        """
+        Get the descriptors of the commands that match the search string,
+        ranked on how well they match.
+
+        :param str search: search string to match with commands
+        :param int/None limit: maximum amount of ranked matches
+        :param callable/None frecency: returns the frecency of a command key
+        :return: Ranked descriptors
+        :rtype: list
+        """
+        tokens = index.tokenize(search)
+        keys = self.session.search(search, self.index)
+
+        matches = [self.commands[k] for k in keys]
+        return score.rank(tokens, matches, limit, frecency)
+
+# ----------------------------------------------------------------------------
+
+def read(path=None):
+    """
+    Create an engine from the cache file, if no path is provided the cache
+    is read from its default location.
+
+    :param str/None path:
+    :return: Engine
+    :rtype: Engine
+    :raises IOError: When the cache cannot be read.
+    """
+    path = path or cache.findDefaultLocation()
+    decoded = cache.decode(path)
+    if not decoded or "data" not in decoded:
+        raise IOError("Unable to read cache: {0}".format(path))
+
+    engine = Engine()
+    engine.load(decoded["data"])
+    return engine
+
+# ----------------------------------------------------------------------------
+
+def main(argv=None):
+    """
+    Query a cache from the command line, the hierarchies of the matching
+    commands are printed, or their descriptors as json.
+
+    :param list/None argv:
+    :return: Exit code
+    :rtype: int
+    """
+    parser = argparse.ArgumentParser(
+        prog="commandSearch",
+        description="Search the commands in Maya's menubar."
+    )
+    parser.add_argument("search", help="search string")
+    parser.add_argument("--cache", help="path of the cache file")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument(
+        "--frecency",
+        action="store_true",
+        help="rank often and recently used commands higher"
+    )
+    parser.add_argument("--json", action="store_true", help="print as json")
+    args = parser.parse_args(argv)
+
+    try:
+        engine = read(args.cache)
+    except IOError as e:
+        sys.stderr.write("{0}\n".format(e))
+        return 1
+
+    frecency = None
+    if args.frecency:
+        from . import usage
+        usage.read()
+        frecency = usage.getScore
+
+    matches = engine.search(args.search, args.limit, frecency)
+    if args.json:
+        print json.dumps([m.asDict() for m in matches], indent=2)
+    else:
+        for match in matches:
+            print match.hierarchy
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+"""
+Record Maya's menubar to a portable fixture file and replay it as an
+equivalent menubar, so the processing and searching of real production
+menus can be profiled outside of Maya.
+
+Record inside of Maya:
+
+::
+    from commandSearch import fixture
+    fixture.record("/tmp/menus.json")
+
+Replay, the menubar is created in the provided window:
+
+::
+    menubar, images = fixture.replay(fixture.read("/tmp/menus.json"), window)
+"""
+import json
+from maya import cmds
+
+from . import commands
+from .ui import utils
+
+# ----------------------------------------------------------------------------
+
+FIXTURE_VERSION = 1
+
+# ----------------------------------------------------------------------------
+
+def record(path, menubar=None):
+    """
+    Record the menubar to the path. Every menu is built by emitting its
+    about to show signal, menus of which the content changes when built
+    are recorded as dynamic.
+
+    :param str path:
+    :param QMenuBar/None menubar: defaults to Maya's menubar
+    :return: Recorded data
+    :rtype: dict
+    """
+    menubar = menubar or utils.mayaMenu()
+    data = {
+        "version": FIXTURE_VERSION,
+        "maya": cmds.about(version=True),
+        "qt": cmds.about(qtVersion=True),
+        "name": menubar.objectName(),
+        "children": recordChildren(menubar),
+    }
+
+    with open(path, "w") as f:
+        json.dump(data, f, indent=1)
+
+    return data
+
+def recordChildren(parent):
+    """
+    Record the menus and items of the parent in the order of its children,
+    option boxes follow the item they belong to.
+
+    :param QWidget parent:
+    :return: Recorded children
+    :rtype: list
+    """
+    children = []
+    for child in parent.children():
+        if type(child) == utils.QMenu:
+            children.append(recordMenu(child))
+        elif type(child) == utils.QWidgetAction:
+            children.append(recordItem(child))
+
+    return children
+
+def recordMenu(menu):
+    """
+    The menu is built and classified the same way it is when processing
+    the menubar.
+
+    :param QMenu menu:
+    :return: Recorded menu
+    :rtype: dict
+    """
+    dynamic, _, _ = commands.buildMenu(menu)
+
+    return {
+        "type": "menu",
+        "title": menu.title(),
+        "name": menu.objectName(),
+        "dynamic": dynamic,
+        "children": recordChildren(menu),
+    }
+
+def recordItem(item):
+    """
+    :param QWidgetAction item:
+    :return: Recorded item
+    :rtype: dict
+    """
+    option = "isOptionBox" in item.dynamicPropertyNames()
+
+    # get icon
+    image = ""
+    if item.objectName() and not option and not item.isSeparator():
+        try:
+            image = cmds.menuItem(
+                utils.qtToMaya(item),
+                query=True,
+                image=True
+            ) or ""
+        except RuntimeError:
+            pass
+
+    return {
+        "type": "item",
+        "text": item.text(),
+        "name": item.objectName(),
+        "optionBox": option,
+        "separator": item.isSeparator(),
+        "image": image,
+    }
+
+# ----------------------------------------------------------------------------
+
+def read(path):
+    """
+    :param str path:
+    :return: Recorded data
+    :rtype: dict
+    :raises ValueError: When the fixture version is not supported.
+    """
+    with open(path, "r") as f:
+        data = json.load(f)
+
+    if data.get("version") != FIXTURE_VERSION:
+        raise ValueError(
+            "Unsupported fixture version: {0}".format(data.get("version"))
+        )
+
+    return data
+
+def count(data):
+    """
+    :param dict data: recorded data
+    :return: Amount of recorded items, option boxes excluded
+    :rtype: int
+    """
+    total = 0
+    for child in data.get("children", []):
+        if child["type"] == "menu":
+            total += count(child)
+        elif not child["optionBox"] and not child["separator"]:
+            total += 1
+
+    return total
+
+# ----------------------------------------------------------------------------
+
+class Replay(object):
+    """
+    Replay
+
+    Rebuilds a recorded menubar. Dynamic menus are created empty, their
+    content is created when their about to show signal is emitted for the
+    first time, the same way Maya builds them. The icons of the items are
+    collected by object name.
+
+    :param dict data: recorded data
+    """
+    def __init__(self, data):
+        self.data = data
+        self.images = {}
+        self.pending = {}
+
+    # ------------------------------------------------------------------------
+
+    def build(self, parent):
+        """
+        :param QMainWindow parent:
+        :return: Menubar
+        :rtype: QMenuBar
+        """
+        menubar = utils.QMenuBar(parent)
+        menubar.setObjectName(self.data.get("name") or "MainMenuBar")
+        self.buildChildren(menubar, self.data.get("children", []))
+        return menubar
+
+    def buildChildren(self, parent, children):
+        """
+        :param QMenuBar/QMenu parent:
+        :param list children: recorded children
+        """
+        for child in children:
+            if child["type"] == "menu":
+                self.buildMenu(parent, child)
+            else:
+                self.buildItem(parent, child)
+
+    def buildMenu(self, parent, data):
+        """
+        :param QMenuBar/QMenu parent:
+        :param dict data: recorded menu
+        """
+        menu = utils.QMenu(data["title"], parent)
+        menu.setObjectName(data["name"])
+        parent.addMenu(menu)
+
+        if not data["dynamic"]:
+            self.buildChildren(menu, data["children"])
+            return
+
+        self.pending[menu] = data["children"]
+        menu.aboutToShow.connect(lambda m=menu: self.show(m))
+
+    def buildItem(self, menu, data):
+        """
+        :param QMenu menu:
+        :param dict data: recorded item
+        """
+        item = utils.QWidgetAction(menu)
+        item.setText(data["text"])
+        item.setObjectName(data["name"])
+        item.setSeparator(data["separator"])
+        if data["optionBox"]:
+            item.setProperty("isOptionBox", True)
+
+        menu.addAction(item)
+
+        if data["image"]:
+            self.images[data["name"]] = data["image"]
+
+    def show(self, menu):
+        """
+        Build the pending content of a dynamic menu.
+
+        :param QMenu menu:
+        """
+        children = self.pending.pop(menu, None)
+        if children:
+            self.buildChildren(menu, children)
+
+def replay(data, parent):
+    """
+    Rebuild the recorded menubar in the parent.
+
+    :param dict data: recorded data
+    :param QMainWindow parent:
+    :return: Menubar and the icons of the items by object name
+    :rtype: tuple
+    """
+    replayer = Replay(data)
+    return replayer.build(parent), replayer.images
@@ -10,7 +10,8 @@ def focus(commandSearch):
     
     :param SearchWidget commandSearch: decorator handles this argument
     """
-    if commandSearch.search.hasFocus() or commandSearch.results.hasFocus():
+    results = commandSearch.results
+    if commandSearch.search.hasFocus() or (results and results.hasFocus()):
         return
 
     ui.mayaWindow().activateWindow()
@@ -0,0 +1,254 @@
+import re
+
+# ----------------------------------------------------------------------------
+
+GRAM_SIZE = 3
+
+# ----------------------------------------------------------------------------
+
+def grams(text):
+    """
+    Split the text into all of its overlapping trigrams.
+
+    :param str text:
+    :return: Trigrams
+    :rtype: set
+    """
+    return set(
+        text[i:i + GRAM_SIZE]
+        for i in range(len(text) - GRAM_SIZE + 1)
+    )
+
+# ----------------------------------------------------------------------------
+
+class Token(object):
+    """
+    Token
+
+    A single whitespace separated part of the search string. Every non word
+    character in the token acts as a wildcard, the fragments in between
+    are used to query the index, the regex is used to verify the
+    candidates.
+
+    :param str text:
+    """
+    def __init__(self, text):
+        text = text.strip()
+
+        # variable
+        self.text = text
+        self.fragments = [f for f in re.split(r"\W", text.lower()) if f]
+        self.regex = re.compile(
+            r".*" + re.sub(r"\W", ".*", text) + r".*",
+            re.I
+        )
+
+    # ------------------------------------------------------------------------
+
+    def match(self, search):
+        """
+        :param str search: search string of a command
+        :rtype: bool
+        """
+        return self.regex.match(search) is not None
+
+def tokenize(search):
+    """
+    Split the search string into tokens, every token has to match for a
+    command to be a valid result.
+
+    :param str search:
+    :return: Tokens
+    :rtype: list
+    """
+    if not search:
+        return []
+
+    return [Token(p) for p in search.split()]
+
+# ----------------------------------------------------------------------------
+
+class Index(object):
+    """
+    Index
+
+    Inverted trigram index over the search strings of the commands. Every
+    trigram points to the set of command keys that contain it, this makes it
+    possible to only verify the commands that contain all trigrams of the
+    search tokens, rather than matching every single command. The version 
+    is increased every time the index changes.
+
+    Copies share their data with the index they were copied from, the 
+    data is copied on write. The postings are copied one at a time, only 
+    the postings that change are copied.
+    """
+    def __init__(self):
+        self.version = 0
+        self.postings = {}
+        self.strings = {}
+        self.shared = False
+        self.owned = None
+
+    # ------------------------------------------------------------------------
+
+    def __len__(self):
+        return len(self.strings)
+
+    def __contains__(self, key):
+        return key in self.strings
+
+    # ------------------------------------------------------------------------
+
+    def copy(self):
+        """
+        :return: Copy of the index that is not affected by changes to this
+            index
+        :rtype: Index
+        """
+        copy = Index()
+        copy.version = self.version
+        copy.strings = self.strings
+        copy.postings = self.postings
+        copy.shared = self.shared = True
+
+        return copy
+
+    def detach(self):
+        """
+        Copy the strings and postings before they are changed, if they are
+        shared with a copy. The sets of the postings remain shared until 
+        they are changed.
+        """
+        if not self.shared:
+            return
+
+        self.strings = dict(self.strings)
+        self.postings = dict(self.postings)
+        self.shared = False
+        self.owned = set()
+
+    def getPosting(self, gram):
+        """
+        :param str gram:
+        :return: Posting of the trigram that can be changed
+        :rtype: set/None
+        """
+        posting = self.postings.get(gram)
+        if posting is None or self.owned is None or gram in self.owned:
+            return posting
+
+        posting = self.postings[gram] = set(posting)
+        self.owned.add(gram)
+        return posting
+
+    def add(self, key, search):
+        """
+        Add a command to the index, if the key already exists it will be
+        replaced.
+
+        :param str key: command key
+        :param str search: search string of the command
+        """
+        if key in self.strings:
+            self.remove(key)
+
+        self.detach()
+        self.version += 1
+        self.strings[key] = search
+        for gram in grams(search):
+            posting = self.getPosting(gram)
+            if posting is None:
+                posting = self.postings[gram] = set()
+                if self.owned is not None:
+                    self.owned.add(gram)
+
+            posting.add(key)
+
+    def remove(self, key):
+        """
+        Remove a command from the index.
+
+        :param str key: command key
+        """
+        if key not in self.strings:
+            return
+
+        self.detach()
+        search = self.strings.pop(key)
+
+        self.version += 1
+        for gram in grams(search):
+            posting = self.getPosting(gram)
+            if posting is None:
+                continue
+
+            posting.discard(key)
+            if not posting:
+                del self.postings[gram]
+
+    # ------------------------------------------------------------------------
+
+    def candidates(self, tokens):
+        """
+        Intersect the postings of all trigrams found in the tokens, starting
+        with the smallest posting. If none of the token fragments is long
+        enough to form a trigram, all keys in the index are returned.
+
+        :param list tokens:
+        :return: Candidate keys
+        :rtype: set
+        """
+        query = set()
+        for token in tokens:
+            for fragment in token.fragments:
+                query.update(grams(fragment))
+
+        if not query:
+            return set(self.strings.keys())
+
+        # get postings
+        postings = []
+        for gram in query:
+            posting = self.postings.get(gram)
+            if not posting:
+                return set()
+
+            postings.append(posting)
+
+        # intersect postings
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                break
+
+        return candidates
+
+    def search(self, tokens, keys=None):
+        """
+        Get all keys of which the search string matches all of the tokens.
+        The index is used to narrow down the candidates, the tokens are
+        used to verify them. If keys are provided, only those keys are
+        verified, this can be used to narrow down a previous result without
+        touching the index.
+
+        :param list tokens:
+        :param set/None keys: keys to limit the search to
+        :return: Matching keys
+        :rtype: set
+        """
+        if not tokens:
+            return set()
+
+        candidates = keys
+        if candidates is None:
+            candidates = self.candidates(tokens)
+
+        matches = set()
+        for key in candidates:
+            search = self.strings[key]
+            if all(token.match(search) for token in tokens):
+                matches.add(key)
+
+        return matches
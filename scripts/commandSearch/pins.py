@@ -1,5 +1,90 @@
 import os
+import sys
 import json
+import atexit
+import tempfile
+import threading
+
+# ----------------------------------------------------------------------------
+
+PINS_NAME = "rjCMDSearch.json"
+WRITE_DELAY = 0.5
+MTIME = None
+MOVEFILE_REPLACE_EXISTING = 0x1
+
+# ----------------------------------------------------------------------------
+
+class State(object):
+    """
+    State
+    
+    Pinned commands of the active pin set. The command keys are stored in 
+    a set for membership tests and in a list that holds the order in which 
+    they are displayed. The hierarchies of the pin set that could not be 
+    resolved to commands yet are kept pending.
+    """
+    def __init__(self):
+        self.name = None
+        self.keys = set()
+        self.order = []
+        self.pending = []
+        
+    # ------------------------------------------------------------------------
+    
+    def __contains__(self, key):
+        return key in self.keys
+        
+    def __len__(self):
+        return len(self.order)
+        
+    # ------------------------------------------------------------------------
+    
+    def set(self, name, keys, pending=None):
+        """
+        Replace the pinned commands with the commands of a pin set.
+        
+        :param str/None name: pin set name
+        :param list keys: command keys
+        :param list/None pending: hierarchies that are not resolved yet
+        """
+        self.name = name
+        self.keys = set()
+        self.order = []
+        self.pending = list(pending or [])
+        
+        for key in keys:
+            self.add(key)
+            
+    def clear(self):
+        self.set(None, [])
+        
+    # ------------------------------------------------------------------------
+        
+    def add(self, key):
+        """
+        :param str key: command key
+        """
+        if key in self.keys:
+            return
+            
+        self.keys.add(key)
+        self.order.append(key)
+        
+    def remove(self, key):
+        """
+        :param str key: command key
+        """
+        if key not in self.keys:
+            return
+            
+        self.keys.discard(key)
+        self.order.remove(key)
+        
+# ----------------------------------------------------------------------------
+
+STATE = State()
+
+# ----------------------------------------------------------------------------
 
 def get():
     """
@@ -13,25 +98,48 @@ def get():
         return {} 
     return globals().get("PINS")
     
+def getState():
+    """
+    Get the state of the active pin set.
+    
+    :return: Pin state
+    :rtype: State
+    """
+    return STATE
+    
 # ----------------------------------------------------------------------------  
 
 def findLocation():
     """
-    Pins get stored in the LOCALAPPDATA variable as a json file, since the
-    local path changes per user, the path gets contructed each time. In case
-    the LOCALAPPDATA directory gets cleared.
+    Pins get stored as a json file, since the local path changes per user, 
+    the path gets contructed each time. The LOCALAPPDATA directory is used
+    when available, otherwise the XDG config directory, Maya's user 
+    preferences directory or the config directory in the home directory.
     
     :return: Path to pins json file
     :rtype: str
     """
     # get app data
-    path = os.environ.get("LOCALAPPDATA")
+    path = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CONFIG_HOME")
     if not path:
-        return
+        path = findPrefsDirectory()
+    if not path:
+        path = os.path.join(os.path.expanduser("~"), ".config")
     
     # get app data file
-    path = os.path.join(path, "rjCMDSearch.json")
+    path = os.path.join(path, PINS_NAME)
     return path  
+    
+def findPrefsDirectory():
+    """
+    :return: Maya's user preferences directory, None outside of Maya
+    :rtype: str/None
+    """
+    try:
+        from maya import cmds
+        return cmds.internalVar(userPrefDir=True)
+    except (ImportError, AttributeError):
+        return
  
 # ----------------------------------------------------------------------------  
 
@@ -39,15 +147,30 @@ def read():
     """
     Decode the data stored in the pins file and set it in the global PINS
     variable. If a path cannot be found, the PINS variable will be an empty
-    dictionary.
+    dictionary. The file is only read when its modification time changed 
+    since it was last read or written and no write is pending.
     """
     global PINS
-    PINS = {}
-
+    global MTIME
+    
+    # a pending write holds the latest pins
+    if "PINS" in globals().keys() and WRITER.isPending():
+        return
+        
     # get pin path
     path = findLocation()
     if not path or not os.path.exists(path):
+        PINS = {}
+        MTIME = None
         return
+        
+    # validate cache
+    mtime = os.path.getmtime(path)
+    if "PINS" in globals().keys() and mtime == MTIME:
+        return
+        
+    PINS = {}
+    MTIME = mtime
 
     # read
     with open(path, "r") as f:
@@ -67,7 +190,8 @@ def read():
 def write():
     """
     Encode the data stored in the global PINS variable and write it to pins
-    location path.
+    location path. The data is written in a background thread, writes 
+    scheduled in quick succession are combined into a single write.
     
     :raises ValueError: if save location cannot be found
     """
@@ -77,9 +201,163 @@ def write():
         raise ValueError("Search Commands: file not found")
         return
     
-    # write data
-    data = json.dumps(get(), indent=4, separators=(",", ":"))
-    with open(path, "w") as f:
-        f.write(data)
+    # schedule data
+    data = dict((k, list(v)) for k, v in get().iteritems())
+    WRITER.schedule(path, data)
+    
+def writeFile(path, data):
+    """
+    Write the data to the path atomically.
+    
+    :param str path:
+    :param dict data: 
+    :return: Modification time of the written file
+    :rtype: float
+    """
+    text = json.dumps(data, indent=4, separators=(",", ":"))
+    return replaceFile(path, text)
+    
+def replaceFile(path, text):
+    """
+    Write the text to a temporary file in the same directory as the path,
+    the temporary file then replaces the path. This way the file is never 
+    left partially written.
+    
+    :param str path:
+    :param str text:
+    :return: Modification time of the written file
+    :rtype: float
+    """
+    directory = os.path.dirname(path)
+    if not os.path.exists(directory):
+        os.makedirs(directory)
         
-    print "Search Commands: pins stored successfully ( {0} )".format(path) 
\ No newline at end of file
+    # write temporary file
+    handle, temp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(handle, "w") as f:
+        f.write(text)
+    
+    # replace file
+    try:
+        moveFile(temp, path)
+    except OSError:
+        os.remove(temp)
+        raise
+        
+    return os.path.getmtime(path)
+    
+def moveFile(source, destination):
+    """
+    Move the source onto the destination, replacing it. Windows doesn't 
+    allow renaming onto an existing file, there the file is moved with 
+    MoveFileExW, which replaces the destination in a single call rather 
+    than removing it first.
+    
+    :param str source:
+    :param str destination:
+    :raises OSError: if the file cannot be moved
+    """
+    if sys.platform != "win32":
+        os.rename(source, destination)
+        return
+        
+    import ctypes
+    encoding = sys.getfilesystemencoding()
+    source, destination = [
+        p.decode(encoding) if isinstance(p, str) else p 
+        for p in (source, destination)
+    ]
+    
+    if not ctypes.windll.kernel32.MoveFileExW(
+        source, 
+        destination, 
+        MOVEFILE_REPLACE_EXISTING
+    ):
+        raise ctypes.WinError()
+    
+# ----------------------------------------------------------------------------
+
+class Writer(object):
+    """
+    Writer
+    
+    Writes the pins file in a background thread. A write is only started 
+    after a delay, data scheduled before then replaces the pending data, so 
+    only the latest data is written. Writes never overlap, a flush waits 
+    for the write in progress to finish.
+    
+    :param float delay: seconds to wait before writing
+    """
+    def __init__(self, delay=WRITE_DELAY):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.writing = threading.Lock()
+        self.pending = None
+        self.timer = None
+        
+    # ------------------------------------------------------------------------
+    
+    def isPending(self):
+        return self.pending is not None
+        
+    def schedule(self, path, data):
+        """
+        :param str path: 
+        :param dict data: 
+        """
+        with self.lock:
+            self.pending = (path, data)
+            if self.timer:
+                return
+                
+            self.timer = threading.Timer(self.delay, self.flush)
+            self.timer.daemon = True
+            self.timer.start()
+            
+    def flush(self):
+        """
+        Write the pending data, can be called from any thread. The timer 
+        is cancelled, so the data isn't written again when it fires. The 
+        data remains pending until it is written, unless newer data is 
+        scheduled in the meantime.
+        """
+        global MTIME
+        
+        with self.writing:
+            with self.lock:
+                pending = self.pending
+                if self.timer:
+                    self.timer.cancel()
+                    self.timer = None
+                
+            if not pending:
+                return
+                
+            try:
+                MTIME = writeFile(*pending)
+            except (IOError, OSError) as e:
+                report(
+                    "Search Commands: unable to store pins ( {0} )".format(e)
+                )
+            finally:
+                with self.lock:
+                    if self.pending is pending:
+                        self.pending = None
+                
+def report(message):
+    """
+    Print the message, inside of Maya the message is printed on the main 
+    thread as printing from other threads is not safe.
+    
+    :param str message:
+    """
+    try:
+        from maya import utils
+        utils.executeDeferred(sys.stdout.write, message + "\n")
+    except ImportError:
+        sys.stdout.write(message + "\n")
+
+# ----------------------------------------------------------------------------
+
+WRITER = Writer()
+atexit.register(WRITER.flush)
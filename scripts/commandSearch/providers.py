@@ -0,0 +1,363 @@
+"""
+Providers add commands from sources other than Maya's menubar. Every
+provider collects its own commands and caches them under its own key, so a
+change in one source only rebuilds the commands of that provider. The
+commands of a provider are grouped under a menu with the title of the
+provider.
+
+Custom providers can be registered, for example to make studio tools
+searchable:
+
+::
+    from commandSearch import providers
+
+    tools = providers.Custom("studioTools", "Studio Tools")
+    tools.add("publish", "Publish Asset", publish, category="Pipeline")
+    providers.register(tools)
+"""
+import os
+
+from . import cache
+
+# ----------------------------------------------------------------------------
+
+PROVIDERS = []
+
+# ----------------------------------------------------------------------------
+
+def register(provider):
+    """
+    Register a provider, a provider with the same name is replaced.
+
+    :param Provider provider:
+    """
+    unregister(provider.name)
+    PROVIDERS.append(provider)
+
+def unregister(name):
+    """
+    :param str name: provider name
+    """
+    PROVIDERS[:] = [p for p in PROVIDERS if p.name != name]
+
+def getProviders():
+    """
+    :return: Registered providers
+    :rtype: list
+    """
+    return list(PROVIDERS)
+
+def getProvider(name):
+    """
+    :param str name: provider name
+    :return: Provider
+    :rtype: Provider/None
+    """
+    for provider in PROVIDERS:
+        if provider.name == name:
+            return provider
+
+# ----------------------------------------------------------------------------
+
+class Script(object):
+    """
+    Script
+
+    Command that evaluates MEL or Python code when triggered.
+
+    :param str command:
+    :param str sourceType: "mel" or "python"
+    """
+    def __init__(self, command, sourceType="mel"):
+        self.command = command
+        self.sourceType = sourceType
+
+    def trigger(self):
+        if self.sourceType == "python":
+            import __main__
+            exec self.command in __main__.__dict__
+            return
+
+        from maya import mel
+        mel.eval(self.command)
+
+class Callback(object):
+    """
+    Callback
+
+    Command that calls a function when triggered.
+
+    :param callable func:
+    """
+    def __init__(self, func):
+        self.func = func
+
+    def trigger(self):
+        self.func()
+
+# ----------------------------------------------------------------------------
+
+class Provider(object):
+    """
+    Provider
+
+    Base class of the command providers. A provider collects the data of
+    its commands, which is cached under the key of the provider, and turns
+    that data into commands that can be triggered. The data of a command
+    holds its label, image, the object names and titles of the menus it is
+    in, starting with the menu of the provider, and any data the provider
+    needs to create the command.
+
+    :param str name: unique name, used for the cache and the command keys
+    :param str title: title of the menu the commands are grouped under
+    """
+    cached = True
+    def __init__(self, name, title):
+        self.name = name
+        self.title = title
+        self.key = None
+
+    # ------------------------------------------------------------------------
+
+    def getCacheName(self):
+        """
+        :return: File name of the cache
+        :rtype: str
+        """
+        return "rjCMDSearch{0}{1}.json".format(
+            self.name[0].upper(),
+            self.name[1:]
+        )
+
+    def getKey(self):
+        """
+        :return: Cache key, the cached data is rebuilt when it changes
+        :rtype: dict
+        """
+        return cache.getKey()
+
+    def getMenus(self, *titles):
+        """
+        :param titles: titles of the menus below the menu of the provider
+        :return: Object names and titles of the menus
+        :rtype: list
+        """
+        menus = [[self.name, self.title]]
+        for title in titles:
+            menus.append(["{0}|{1}".format(menus[-1][0], title), title])
+
+        return menus
+
+    # ------------------------------------------------------------------------
+
+    def collect(self):
+        """
+        :return: Command data by key
+        :rtype: dict
+        """
+        raise NotImplementedError
+
+    def getCommand(self, key, data):
+        """
+        :param str key:
+        :param dict data:
+        :return: Command that can be triggered
+        :rtype: object
+        """
+        raise NotImplementedError
+
+    def getOption(self, key, data):
+        """
+        :param str key:
+        :param dict data:
+        :return: Option box command that can be triggered
+        :rtype: object/None
+        """
+        return
+
+# ----------------------------------------------------------------------------
+
+class Shelves(Provider):
+    """
+    Shelves
+
+    Provides the buttons on the shelves, grouped by shelf. The command of a
+    button is evaluated when triggered, its double click command is used as
+    the option box. The cache is rebuilt when the shelf files are saved.
+    """
+    def __init__(self):
+        Provider.__init__(self, "shelves", "Shelves")
+
+    # ------------------------------------------------------------------------
+
+    def getKey(self):
+        from maya import cmds
+
+        files = []
+        path = cmds.internalVar(userShelfDir=True)
+        if path and os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                mtime = os.path.getmtime(os.path.join(path, name))
+                files.append([name, int(mtime)])
+
+        # the shelves don't depend on the ui language or loaded plugins
+        key = cache.getVersionKey()
+        key["shelves"] = files
+        return key
+
+    def collect(self):
+        from maya import cmds, mel
+
+        data = {}
+        top = mel.eval("$tmpVar=$gShelfTopLevel")
+        for shelf in cmds.tabLayout(top, query=True, childArray=True) or []:
+            buttons = cmds.shelfLayout(shelf, query=True, childArray=True)
+            for button in buttons or []:
+                if cmds.objectTypeUI(button) != "shelfButton":
+                    continue
+
+                label = cmds.shelfButton(button, query=True, label=True)
+                label = label or cmds.shelfButton(
+                    button,
+                    query=True,
+                    annotation=True
+                )
+                if not label:
+                    continue
+
+                data[button] = {
+                    "menus": self.getMenus(shelf),
+                    "label": label,
+                    "image": cmds.shelfButton(button, query=True, image=True),
+                    "command": cmds.shelfButton(
+                        button,
+                        query=True,
+                        command=True
+                    ),
+                    "sourceType": cmds.shelfButton(
+                        button,
+                        query=True,
+                        sourceType=True
+                    ),
+                    "option": cmds.shelfButton(
+                        button,
+                        query=True,
+                        doubleClickCommand=True
+                    ),
+                }
+
+        return data
+
+    def getCommand(self, key, data):
+        return Script(data["command"], data["sourceType"])
+
+    def getOption(self, key, data):
+        if data["option"]:
+            return Script(data["option"], data["sourceType"])
+
+class RuntimeCommands(Provider):
+    """
+    Runtime Commands
+
+    Provides the runtime commands, grouped by their category. The cache is
+    rebuilt when the loaded plugins or the user runtime commands change.
+    """
+    def __init__(self):
+        Provider.__init__(self, "runtimeCommands", "Runtime Commands")
+
+    # ------------------------------------------------------------------------
+
+    def getKey(self):
+        from maya import cmds
+
+        path = os.path.join(
+            cmds.internalVar(userPrefDir=True),
+            "userRunTimeCommands.mel"
+        )
+        mtime = os.path.getmtime(path) if os.path.exists(path) else None
+
+        key = Provider.getKey(self)
+        key["user"] = mtime and int(mtime)
+        return key
+
+    def collect(self):
+        from maya import cmds
+
+        data = {}
+        for name in cmds.runTimeCommand(query=True, commandArray=True) or []:
+            label = cmds.runTimeCommand(name, query=True, label=True) or name
+            category = cmds.runTimeCommand(name, query=True, category=True)
+            titles = [t for t in (category or "").split(".") if t]
+
+            data[name] = {
+                "menus": self.getMenus(*titles),
+                "label": label,
+                "image": cmds.runTimeCommand(name, query=True, image=True),
+                "option": None,
+            }
+
+        return data
+
+    def getCommand(self, key, data):
+        return Script(key)
+
+class Custom(Provider):
+    """
+    Custom
+
+    Provides commands that are added to it from code, as they hold
+    functions they are not cached.
+
+    :param str name: unique name, used for the command keys
+    :param str title: title of the menu the commands are grouped under
+    """
+    cached = False
+    def __init__(self, name, title):
+        Provider.__init__(self, name, title)
+        self.callbacks = {}
+        self.data = {}
+
+    # ------------------------------------------------------------------------
+
+    def add(self, key, label, func, image="", category=None, option=None):
+        """
+        :param str key: unique key within the provider
+        :param str label:
+        :param callable func: called when the command is triggered
+        :param str image: Name of the icon
+        :param str/None category: titles of the menus separated by a "."
+        :param callable/None option: called when the option box is triggered
+        """
+        titles = [t for t in (category or "").split(".") if t]
+        self.callbacks[key] = (func, option)
+        self.data[key] = {
+            "menus": self.getMenus(*titles),
+            "label": label,
+            "image": image,
+            "option": bool(option),
+        }
+
+    def remove(self, key):
+        """
+        :param str key:
+        """
+        self.callbacks.pop(key, None)
+        self.data.pop(key, None)
+
+    # ------------------------------------------------------------------------
+
+    def collect(self):
+        return dict(self.data)
+
+    def getCommand(self, key, data):
+        return Callback(self.callbacks[key][0])
+
+    def getOption(self, key, data):
+        option = self.callbacks[key][1]
+        if option:
+            return Callback(option)
+
+# ----------------------------------------------------------------------------
+
+register(Shelves())
+register(RuntimeCommands())
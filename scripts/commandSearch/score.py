@@ -0,0 +1,123 @@
+import math
+import heapq
+
+# ----------------------------------------------------------------------------
+
+CONSECUTIVE_SCORE = 2.0
+BOUNDARY_SCORE = 6.0
+CAMEL_SCORE = 4.0
+START_SCORE = 4.0
+SPAN_SCORE = 1.0
+
+LABEL_WEIGHT = 3.0
+PATH_WEIGHT = 1.0
+LENGTH_PENALTY = 0.05
+FRECENCY_WEIGHT = 4.0
+
+# ----------------------------------------------------------------------------
+
+def isBoundary(text, i):
+    """
+    :param str text:
+    :param int i: character index
+    :return: If the character starts a word
+    :rtype: bool
+    """
+    return i == 0 or not text[i - 1].isalnum()
+
+def isCamel(text, i):
+    """
+    :param str text:
+    :param int i: character index
+    :return: If the character starts a camel case hump
+    :rtype: bool
+    """
+    return i > 0 and text[i].isupper() and text[i - 1].islower()
+
+# ----------------------------------------------------------------------------
+
+def scoreFragment(fragment, text):
+    """
+    Score the best occurrence of the fragment in the text. Every character
+    matched consecutively adds to the score, occurrences that start at
+    the beginning of the text, at the start of a word or at a camel case
+    hump are rewarded.
+
+    :param str fragment: lower case fragment
+    :param str text:
+    :return: Score, 0 if the fragment cannot be found
+    :rtype: float
+    """
+    lower = text.lower()
+
+    best = 0.0
+    i = lower.find(fragment)
+    while i != -1:
+        value = len(fragment) * CONSECUTIVE_SCORE
+        if i == 0:
+            value += START_SCORE
+        if isBoundary(text, i):
+            value += BOUNDARY_SCORE
+        elif isCamel(text, i):
+            value += CAMEL_SCORE
+
+        best = max(best, value)
+        i = lower.find(fragment, i + 1)
+
+    return best
+
+def score(tokens, label, hierarchy):
+    """
+    Score how well the tokens match a command. Every fragment of the tokens
+    is scored against both the label and the hierarchy of the command,
+    matches in the label weigh heavier than matches in the path. Fragments
+    that only match across menu titles get a small fixed score. Shorter
+    labels are preferred when the scores are otherwise equal.
+
+    :param list tokens:
+    :param str label: command label
+    :param str hierarchy: command hierarchy
+    :return: Score
+    :rtype: float
+    """
+    total = 0.0
+    for token in tokens:
+        for fragment in token.fragments:
+            value = max(
+                scoreFragment(fragment, label) * LABEL_WEIGHT,
+                scoreFragment(fragment, hierarchy) * PATH_WEIGHT,
+            )
+            total += value or SPAN_SCORE
+
+    return total - len(label) * LENGTH_PENALTY
+
+# ----------------------------------------------------------------------------
+
+def rank(tokens, matches, limit=None, frecency=None):
+    """
+    Rank the matches on their score, only the best matches up to the limit
+    are selected using a bounded heap, rather than sorting all of the
+    matches. Matches with the same score are sorted by hierarchy. When a 
+    frecency function is provided, the logarithm of the frecency of a 
+    command is added to its score, so often and recently used commands 
+    rank higher.
+
+    :param list tokens:
+    :param list matches: Command list
+    :param int/None limit: maximum amount of matches to return
+    :param callable/None frecency: returns the frecency of a command key
+    :return: Ranked commands
+    :rtype: list
+    """
+    def key(match):
+        hierarchy = match.hierarchy
+        value = score(tokens, match.name, hierarchy)
+        if frecency:
+            value += math.log1p(frecency(match.key)) * FRECENCY_WEIGHT
+            
+        return -value, hierarchy
+
+    if limit is None:
+        return sorted(matches, key=key)
+
+    return heapq.nsmallest(limit, matches, key=key)
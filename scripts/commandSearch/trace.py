@@ -0,0 +1,205 @@
+"""
+Timing spans of the command search. Spans are disabled by default, in
+which case entering a span costs a single global lookup. Once enabled, the
+duration of every span is collected by name and the most recent spans are
+kept so they can be exported as a Chrome trace.
+
+::
+    import commandSearch
+    commandSearch.trace.enable()
+    ...
+    commandSearch.stats()
+    commandSearch.trace.export("/tmp/commandSearch.json")
+"""
+import os
+import json
+import thread
+from functools import wraps
+from collections import deque
+from timeit import default_timer as clock
+
+# ----------------------------------------------------------------------------
+
+ENABLED = False
+MAX_EVENTS = 100000
+MAX_SAMPLES = 10000
+PERCENTILES = [50, 90, 99]
+
+TIMINGS = {}
+EVENTS = deque(maxlen=MAX_EVENTS)
+ORIGIN = clock()
+LOCK = thread.allocate_lock()
+
+# ----------------------------------------------------------------------------
+
+class Span(object):
+    """
+    Span
+
+    Context manager that records its duration under its name once exited.
+
+    :param str name:
+    :param dict args: additional information stored with the event
+    """
+    __slots__ = ("name", "args", "start")
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+        self.start = None
+
+    def __enter__(self):
+        self.start = clock()
+        return self
+
+    def __exit__(self, *exc):
+        add(self.name, self.start, clock() - self.start, self.args)
+
+class NullSpan(object):
+    """
+    Null Span
+
+    Context manager that does nothing, it is returned when tracing is
+    disabled.
+    """
+    __slots__ = ()
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+NULL_SPAN = NullSpan()
+
+# ----------------------------------------------------------------------------
+
+def enable(state=True):
+    """
+    :param bool state: enable or disable the spans
+    """
+    global ENABLED
+    ENABLED = state
+
+def isEnabled():
+    return ENABLED
+
+def clear():
+    """
+    Remove all collected timings and events.
+    """
+    with LOCK:
+        TIMINGS.clear()
+
+    EVENTS.clear()
+
+# ----------------------------------------------------------------------------
+
+def span(name, **args):
+    """
+    :param str name:
+    :param args: additional information stored with the event
+    :return: Span, does nothing when disabled
+    :rtype: Span/NullSpan
+    """
+    if not ENABLED:
+        return NULL_SPAN
+
+    return Span(name, args)
+
+def traced(name):
+    """
+    This decorator runs the function within a span of the provided name.
+
+    :param str name:
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return func(*args, **kwargs)
+
+            with Span(name, None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def add(name, start, duration, args=None):
+    """
+    Add the duration of a span, spans can be added from any thread. The
+    timings are updated under a lock, as the count and total are not
+    updated atomically.
+
+    :param str name:
+    :param float start: start time in seconds
+    :param float duration: duration in seconds
+    :param dict/None args:
+    """
+    with LOCK:
+        timing = TIMINGS.get(name)
+        if timing is None:
+            timing = TIMINGS[name] = [0, 0.0, deque(maxlen=MAX_SAMPLES)]
+
+        timing[0] += 1
+        timing[1] += duration
+        timing[2].append(duration)
+
+    EVENTS.append((name, start, duration, thread.get_ident(), args))
+
+# ----------------------------------------------------------------------------
+
+def stats():
+    """
+    Get the count, total and mean duration and the percentiles of the
+    most recent durations of every span. Durations are in milliseconds.
+
+    :return: Timings by span name
+    :rtype: dict
+    """
+    with LOCK:
+        timings = [
+            (name, count, total, list(samples))
+            for name, (count, total, samples) in TIMINGS.items()
+        ]
+
+    data = {}
+    for name, count, total, samples in timings:
+        samples = sorted(samples)
+        info = {
+            "count": count,
+            "total": total * 1000,
+            "mean": total * 1000 / count,
+            "max": samples[-1] * 1000,
+        }
+        for p in PERCENTILES:
+            i = int(round(p / 100.0 * (len(samples) - 1)))
+            info["p{0}".format(p)] = samples[i] * 1000
+
+        data[name] = info
+
+    return data
+
+def export(path):
+    """
+    Write the most recent spans to the path as a Chrome trace, which can be
+    opened in chrome://tracing.
+
+    :param str path:
+    """
+    pid = os.getpid()
+
+    events = []
+    for name, start, duration, tid, args in list(EVENTS):
+        event = {
+            "name": name,
+            "ph": "X",
+            "ts": (start - ORIGIN) * 1000000,
+            "dur": duration * 1000000,
+            "pid": pid,
+            "tid": tid,
+        }
+        if args:
+            event["args"] = args
+
+        events.append(event)
+
+    with open(path, "w") as f:
+        json.dump({"traceEvents": events}, f)
@@ -0,0 +1,155 @@
+class Node(object):
+    """
+    Node
+
+    Menu in the menu tree. Every node holds the title and object name of
+    its menu, its child menus and the commands it contains directly. Paths
+    are never stored, they are built by walking up the parents, this way
+    commands in the same menu share the same path.
+
+    :param str title: title of the menu
+    :param str name: object name of the menu
+    :param Node/None parent:
+    """
+    __slots__ = ("title", "name", "parent", "children", "commands")
+    def __init__(self, title="", name="", parent=None):
+        self.title = intern(title)
+        self.name = name
+        self.parent = parent
+        self.children = {}
+        self.commands = []
+
+    # ------------------------------------------------------------------------
+
+    def add(self, title, name):
+        """
+        Get the child menu with the provided object name, if it doesn't
+        exist it will be created. If it does exist, its title is updated.
+
+        :param str title: title of the menu
+        :param str name: object name of the menu
+        :return: Child node
+        :rtype: Node
+        """
+        child = self.children.get(name)
+        if child is None:
+            child = Node(title, name, self)
+            self.children[name] = child
+        else:
+            child.title = intern(title)
+
+        return child
+
+    def prune(self):
+        """
+        Remove the menus below this node that hold no commands, such as 
+        menus that Maya rebuilt under a new object name.
+
+        :return: If this node holds no commands
+        :rtype: bool
+        """
+        for name, child in self.children.items():
+            if child.prune():
+                del self.children[name]
+
+        return not self.commands and not self.children
+
+    def find(self, titles):
+        """
+        Find a node below this node by the titles of its menus.
+
+        :param list titles:
+        :return: Node
+        :rtype: Node/None
+        """
+        node = self
+        for title in titles:
+            for child in node.children.itervalues():
+                if child.title == title:
+                    node = child
+                    break
+            else:
+                return
+
+        return node
+
+    # ------------------------------------------------------------------------
+
+    def path(self):
+        """
+        :return: Nodes from the top most menu to this node, the root node is
+            excluded
+        :rtype: list
+        """
+        nodes = []
+        node = self
+        while node.parent is not None:
+            nodes.append(node)
+            node = node.parent
+
+        nodes.reverse()
+        return nodes
+
+    def titles(self):
+        """
+        :return: Titles from the top most menu to this node
+        :rtype: list
+        """
+        return [node.title for node in self.path()]
+
+    def names(self):
+        """
+        :return: Object names from the top most menu to this node
+        :rtype: list
+        """
+        return [node.name for node in self.path()]
+
+    # ------------------------------------------------------------------------
+
+    def walk(self):
+        """
+        Iterate over all commands in this node and the nodes below it.
+
+        :return: Commands
+        :rtype: generator
+        """
+        for command in self.commands:
+            yield command
+
+        for child in self.children.itervalues():
+            for command in child.walk():
+                yield command
+
+    def search(self, tokens, prefix=None):
+        """
+        Get all commands below this node that match all of the tokens. The
+        search string of a command starts with the search string of its
+        menu, so a token that matches the search string of a menu matches
+        all commands below it and is not verified any further in that
+        subtree.
+
+        :param list tokens:
+        :param str/None prefix: search string of the parent node
+        :return: Matching commands
+        :rtype: list
+        """
+        if prefix is None:
+            prefix = "".join([t.lower() for t in self.titles()])
+        else:
+            prefix += self.title.lower()
+
+        # remove tokens matched by the menu
+        tokens = [token for token in tokens if not token.match(prefix)]
+
+        # match commands
+        matches = []
+        for command in self.commands:
+            search = prefix + command.label.lower()
+            if all(token.match(search) for token in tokens):
+                matches.append(command)
+
+        # match children
+        for child in self.children.itervalues():
+            matches.extend(child.search(tokens, prefix))
+
+        return matches
@@ -1,8 +1,4 @@
 from .utils import *
-from .search import *
-from .manager import *
-from .results import *
-from .commands import *
 
 
 # ----------------------------------------------------------------------------
@@ -17,10 +13,14 @@ COMMAND_SEARCH = None
 
 def install():
     """
-    Add the cmd search functionality to Maya's native status bar.
+    Add the cmd search functionality to Maya's native status bar. Only the 
+    search field is created, the other ui modules are imported and their 
+    widgets created once the search field is used.
     
     :raises RuntimeError: When the command search is already installed.
     """
+    from .search import SearchWidget
+    
     global COMMAND_SEARCH
     
     # validate timeline marker
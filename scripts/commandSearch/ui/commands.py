@@ -1,25 +1,60 @@
-from . import utils
-    
+import difflib
+from collections import OrderedDict
+from . import icons, utils
+from .. import trace, usage
+
 # ----------------------------------------------------------------------------
-    
+
 PIN_ICON = ":/nodeGrapherPinnedLarge.png"
 UNPIN_ICON = ":/nodeGrapherUnpinnedLarge.png"
 OPTION_ICON = ":/hsNothing.png"
 
+ROW_HEIGHT = 20
+DIVIDER_HEIGHT = 12
+ICON_SIZE = 18
+
+COMMAND_ROLE = utils.Qt.UserRole
+DIVIDER_ROLE = utils.Qt.UserRole + 1
+
 # ----------------------------------------------------------------------------
+
+def execute(info, option=False):
+    """
+    Trigger the command or the option box of the command, the use is 
+    logged so it counts towards the frecency of the command. If the menu 
+    item of the command no longer exists, only a message is printed.
+
+    :param Command info:
+    :param bool option: trigger the option box
+    """
+    command = info.cmdOption if option else info.cmd
+    if not command:
+        return
+
+    usage.log(info.key, option)
     
+    try:
+        command.trigger()
+    except RuntimeError as e:
+        print e
+
+# ----------------------------------------------------------------------------
+
 class Commands(utils.QWidget):
     """
     Commands
-    
+
     The commands widget is the widget that gets populated with the searched
-    commands.
-    
+    commands. The commands are stored in a model and painted by a delegate,
+    only the visible rows are painted. When scrolled to the bottom it will
+    request more commands.
+
     :param QWidget parent:
     """
+    requestMore = utils.Signal()
     def __init__(self, parent=None):
         utils.QWidget.__init__(self, parent)
-        
+
         # variable
         self.parent = parent
 
@@ -28,190 +63,367 @@ class Commands(utils.QWidget):
         layout.setContentsMargins(0,0,0,0)
         layout.setSpacing(0)
 
-        # create scroll area
-        scrollArea = utils.QScrollArea(self)
-        scrollArea.setWidgetResizable(True)
-        scrollArea.setHorizontalScrollBarPolicy(utils.Qt.ScrollBarAlwaysOff)
-        
-        # create main widget widget
-        self.widget = utils.QWidget()
-        
-        # create main layout
-        self.layout = utils.QVBoxLayout(self.widget)
-        self.layout.setContentsMargins(3,0,3,0)
-        self.layout.setSpacing(0)
+        # create model
+        self.model = CommandsModel(self)
+
+        # create view
+        self.view = utils.QListView(self)
+        self.view.setModel(self.model)
+        self.view.setItemDelegate(CommandsDelegate(self.view))
+        self.view.setMouseTracking(True)
+        self.view.setFrameShape(utils.QFrame.NoFrame)
+        self.view.setSelectionMode(utils.QAbstractItemView.NoSelection)
+        self.view.setVerticalScrollMode(utils.QAbstractItemView.ScrollPerPixel)
+        self.view.setHorizontalScrollBarPolicy(utils.Qt.ScrollBarAlwaysOff)
+        layout.addWidget(self.view)
+
+        scrollBar = self.view.verticalScrollBar()
+        scrollBar.valueChanged.connect(self.scrolled)
 
-        scrollArea.setWidget(self.widget)
-        layout.addWidget(scrollArea)
-        
-        # spacer
-        spacer = utils.QSpacerItem(
-            1, 
-            1, 
-            utils.QSizePolicy.Minimum,
-            utils.QSizePolicy.Expanding
-        )
-        self.layout.addItem(spacer)
-        
     # ------------------------------------------------------------------------
-        
+
+    def sizeHint(self):
+        """
+        The height of the widget is the height of all rows, limited by the
+        maximum height.
+
+        :rtype: QSize
+        """
+        height = 0
+        for group, info in self.model.rows:
+            height += DIVIDER_HEIGHT if info is None else ROW_HEIGHT
+
+        height = min(height, self.maximumHeight())
+        return utils.QSize(utils.QWidget.sizeHint(self).width(), height)
+
+    # ------------------------------------------------------------------------
+
     def clear(self):
-        for i in reversed(range(self.layout.count()-1)):
-            item = self.layout.itemAt(i)
-            item.widget().deleteLater()
-    
+        self.model.setRows([])
+
+    @trace.traced("Commands.populate")
     def populate(self, matches):
         """
-        Populate widget with commands from input.
-        
+        Populate widget with commands from input. The commands are grouped,
+        the groups are ordered by their first command, keeping the pinned
+        commands on top.
+
         :param list matches: Command list
         """
-        # clear
-        self.clear()
-    
-        # filter
-        previousGroup = None
+        # group
+        groups = OrderedDict()
         for match in matches:
-            # create group divider
-            group = match.get("group")
-            if group != previousGroup:
-                divider = utils.Divider(self.widget, group)
-                self.add(divider)
-                 
-            # create command
-            button = Button(self.widget, match)
-            self.add(button)
-            previousGroup = group
-            
+            key = (match.pin, match.group)
+            groups.setdefault(key, []).append(match)
+
+        # filter
+        rows = []
+        for (_, group), infos in groups.iteritems():
+            rows.append((group, None))
+            rows.extend((group, info) for info in infos)
+
+        self.model.setRows(rows)
+        self.updateGeometry()
+
     # ------------------------------------------------------------------------
-    
-    def add(self, widget):
+
+    def scrolled(self, value):
         """
-        Add widget to layout, inserts it at -1 as there is always a spacer
-        that needs to remain at the bottom.
-        
-        :param QWidget widget:
+        Request more commands when the scroll bar reaches the bottom.
+
+        :param int value:
         """
-        self.layout.insertWidget(self.layout.count() - 1, widget)
-        
+        scrollBar = self.sender()
+        if value and value == scrollBar.maximum():
+            self.requestMore.emit()
+
     def isEmpty(self):
         """
-        Check if the widgets layout is empty.
-        
+        Check if the model is empty.
+
         :rtype: bool
         """
-        return self.layout.isEmpty()
+        return not self.model.rowCount()
 
-class Button(utils.QWidget):
-    """
-    Button
-    
-    This widget gets initialized with the command data and builds it
-    accordingly, the only variable option is the option box that may
-    or may not be added into the info.
-    
-    :param QWidget parent:
-    :param dict info:
+# ----------------------------------------------------------------------------
+
+class CommandsModel(utils.QAbstractListModel):
     """
-    def __init__(self, parent, info):
-        utils.QWidget.__init__(self, parent)
+    Commands Model
 
-        # variable
-        self.info = info
-        self.setFixedHeight(20)
-        
-        # style sheet
-        basicSS = "QPushButton{text-align: left;}"
-        hoverSS1 = "QPushButton:hover{ \
-            border: 1px solid orange; \
-            border-radius: 3px; \
-            background-color: orange; \
-        }"
-        hoverSS2 = "QPushButton:hover{color: orange;}"
-        
-        # get exec
-        self.command = info.get("cmd")
-        self.commandOption = info.get("cmdOption")
-        
-        # create pin
-        self.pin = utils.QPushButton(self)
-        self.pin.setStyleSheet(hoverSS1)
-        self.setAsIcon(self.pin)
-        
-        # create icon
-        icon = utils.QPushButton(self)
-        icon.setIcon(info.get("icon"))
-        icon.released.connect(self.exec_)
-        self.setAsIcon(icon)
-        
-        # create main
-        main = utils.QPushButton(info.get("name"), self)
-        main.setFixedHeight(20)
-        main.setStyleSheet(basicSS + hoverSS2)
-        main.setFlat(True)
-        main.setToolTip(info.get("hierarchy"))
-        main.released.connect(self.exec_)
+    List model of the searched commands, every row is either a group
+    divider or a command. Rows are stored as tuples of the group name and
+    the command, the command of a divider is None. Setting new 
+    rows only inserts and removes the rows that changed.
+
+    :param QObject parent:
+    """
+    def __init__(self, parent=None):
+        utils.QAbstractListModel.__init__(self, parent)
+        self.rows = []
 
-        # create layout
-        layout = utils.QHBoxLayout(self)
-        layout.setContentsMargins(0,0,0,0)
-        layout.setSpacing(0)
-        
-        # add widgets
-        layout.addWidget(self.pin)
-        layout.addWidget(icon)
-        layout.addWidget(main)
-        
-        # create option box
-        if self.commandOption:
-            option = utils.QPushButton(self)
-            option.setStyleSheet(hoverSS1)
-            option.setIcon(utils.QIcon(OPTION_ICON))
-            option.pressed.connect(self.execOption_)
-            self.setAsIcon(option)
-            layout.addWidget(option)
-            
-        # set pin
-        if info.get("pin"):         self.setPin()
-        else:                       self.setUnpin()
-            
     # ------------------------------------------------------------------------
-    
-    def setAsIcon(self, b):
+
+    def getKey(self, row):
         """
-        Sometimes a command will have an icon assigned to it, to make sure 
-        the button looks like an icon this function can be used, to set those
-        attributes.
-        
-        :param QPushButton b:
+        :param tuple row: Group name and command
+        :return: Key that identifies the row
+        :rtype: tuple
         """
-        b.setFixedWidth(20)
-        b.setFixedHeight(20)
-        b.setFlat(True)
-        b.setIconSize(utils.QSize(18,18))  
-          
-    # ------------------------------------------------------------------------
+        group, info = row
+        if info is None:
+            return "divider", group
+
+        return "command", info.key
+
+    def setRows(self, rows):
+        """
+        Reconcile the current rows with the new rows by key. Rows present 
+        in both are left alone, only the inserted and removed ranges are 
+        reported to the view. Rows of which the command was replaced,
+        after the commands were stored again, are reported as changed. The 
+        changes are applied in reverse, so the indices of the changes still
+        to be applied remain valid.
         
-    def setPin(self):
-        self.info["pin"] = True
-        self.pin.setIcon(utils.QIcon(PIN_ICON))
-        self.pin.pressed.connect(self.setUnpin)
-
-    def setUnpin(self):
-        self.info["pin"] = False
-        self.pin.setIcon(utils.QIcon(UNPIN_ICON))
-        self.pin.pressed.connect(self.setPin)
+        :param list rows: Group name and command tuples
+        """
+        matcher = difflib.SequenceMatcher(
+            None,
+            [self.getKey(row) for row in self.rows],
+            [self.getKey(row) for row in rows],
+            autojunk=False
+        )
         
+        for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes()):
+            if tag == "equal":
+                changed = any(
+                    a[1] is not b[1] 
+                    for a, b in zip(self.rows[i1:i2], rows[j1:j2])
+                )
+                if changed:
+                    self.rows[i1:i2] = rows[j1:j2]
+                    self.dataChanged.emit(self.index(i1), self.index(i2 - 1))
+                    
+                continue
+                
+            # remove rows
+            if i2 > i1:
+                self.beginRemoveRows(utils.QModelIndex(), i1, i2 - 1)
+                del self.rows[i1:i2]
+                self.endRemoveRows()
+                
+            # insert rows
+            if j2 > j1:
+                self.beginInsertRows(utils.QModelIndex(), i1, i1 + j2 - j1 - 1)
+                self.rows[i1:i1] = rows[j1:j2]
+                self.endInsertRows()
+
+    def setPin(self, index, state):
+        """
+        :param QModelIndex index:
+        :param bool state: pin state
+        """
+        info = self.rows[index.row()][1]
+        if info is None:
+            return
+
+        info.pin = state
+        self.dataChanged.emit(index, index)
+
     # ------------------------------------------------------------------------
-         
-    def exec_(self):
-        if not self.command:
+
+    def rowCount(self, parent=utils.QModelIndex()):
+        if parent.isValid():
+            return 0
+
+        return len(self.rows)
+
+    def flags(self, index):
+        return utils.Qt.ItemIsEnabled
+
+    def data(self, index, role=utils.Qt.DisplayRole):
+        if not index.isValid():
             return
-            
-        self.command.trigger()
-   
-    def execOption_(self):
-        if not self.commandOption:
+
+        group, info = self.rows[index.row()]
+        if role == DIVIDER_ROLE:
+            return info is None
+        elif role == COMMAND_ROLE:
+            return info
+
+        # divider
+        if info is None:
+            if role == utils.Qt.DisplayRole:
+                return group
             return
-            
-        self.commandOption.trigger()
\ No newline at end of file
+
+        # command
+        if role == utils.Qt.DisplayRole:
+            return info.name
+        elif role == utils.Qt.DecorationRole:
+            return icons.getIcon(info.getImage())
+        elif role == utils.Qt.ToolTipRole:
+            return info.hierarchy
+
+# ----------------------------------------------------------------------------
+
+class CommandsDelegate(utils.QStyledItemDelegate):
+    """
+    Commands Delegate
+
+    Paints the rows of the commands model. Dividers are painted as a group
+    name in between two lines, commands are painted as a pin, an icon,
+    a label and an option box if the command has one. Releasing the mouse
+    on the pin toggles the pin state, on the option box triggers the
+    option box and anywhere else triggers the command. Icons, fonts and
+    colors are created once rather than for every painted row.
+
+    :param QListView parent:
+    """
+    def __init__(self, parent=None):
+        utils.QStyledItemDelegate.__init__(self, parent)
+
+        # variable
+        self.pinIcon = icons.getConstantIcon(PIN_ICON)
+        self.unpinIcon = icons.getConstantIcon(UNPIN_ICON)
+        self.optionIcon = icons.getConstantIcon(OPTION_ICON)
+
+        font = parent.font() if parent else utils.QFont()
+        self.dividerFont = utils.QFont(font)
+        self.dividerFont.setBold(True)
+        self.dividerMetrics = utils.QFontMetrics(self.dividerFont)
+
+    # ------------------------------------------------------------------------
+
+    def getRects(self, rect, info):
+        """
+        Get the areas of the pin, icon, label and option box within the rect
+        of a command row. If the command has no option box, its area will
+        be None.
+
+        :param QRect rect:
+        :param Command info:
+        :return: Pin, icon, label and option box areas
+        :rtype: tuple
+        """
+        pin = utils.QRect(rect.x(), rect.y(), ROW_HEIGHT, ROW_HEIGHT)
+        icon = pin.translated(ROW_HEIGHT, 0)
+
+        option = None
+        width = rect.width() - ROW_HEIGHT * 2
+        if info.cmdOption:
+            option = utils.QRect(
+                rect.right() - ROW_HEIGHT + 1,
+                rect.y(),
+                ROW_HEIGHT,
+                ROW_HEIGHT
+            )
+            width -= ROW_HEIGHT
+
+        label = utils.QRect(icon.right() + 1, rect.y(), width, ROW_HEIGHT)
+        return pin, icon, label, option
+
+    def getIconRect(self, rect):
+        """
+        :param QRect rect: area of the button
+        :return: Icon area centered in the button area
+        :rtype: QRect
+        """
+        icon = utils.QRect(0, 0, ICON_SIZE, ICON_SIZE)
+        icon.moveCenter(rect.center())
+        return icon
+
+    # ------------------------------------------------------------------------
+
+    def sizeHint(self, option, index):
+        if index.data(DIVIDER_ROLE):
+            return utils.QSize(option.rect.width(), DIVIDER_HEIGHT)
+
+        return utils.QSize(option.rect.width(), ROW_HEIGHT)
+
+    def paint(self, painter, option, index):
+        painter.save()
+
+        if index.data(DIVIDER_ROLE):
+            self.paintDivider(painter, option.rect, index.data())
+        else:
+            self.paintCommand(painter, option, index.data(COMMAND_ROLE))
+
+        painter.restore()
+
+    def paintDivider(self, painter, rect, group):
+        """
+        :param QPainter painter:
+        :param QRect rect:
+        :param str group: Name to be used in the divider
+        """
+        # get label area
+        width = self.dividerMetrics.width(group)
+        label = utils.QRect(0, rect.y(), width, rect.height())
+        label.moveCenter(rect.center())
+
+        # paint lines
+        y = rect.center().y()
+        painter.setPen(utils.LINE_COLOR)
+        painter.drawLine(rect.left() + 12, y, label.left() - 12, y)
+        painter.drawLine(label.right() + 12, y, rect.right() - 12, y)
+
+        # paint label
+        painter.setFont(self.dividerFont)
+        painter.setPen(utils.HIGHLIGHT_COLOR)
+        painter.drawText(label, utils.Qt.AlignCenter, group)
+
+    def paintCommand(self, painter, option, info):
+        """
+        :param QPainter painter:
+        :param QStyleOptionViewItem option:
+        :param Command info:
+        """
+        pin, icon, label, optionBox = self.getRects(option.rect, info)
+
+        # paint icons
+        pinIcon = self.pinIcon if info.pin else self.unpinIcon
+        pinIcon.paint(painter, self.getIconRect(pin))
+
+        commandIcon = icons.getIcon(info.getImage())
+        if commandIcon:
+            commandIcon.paint(painter, self.getIconRect(icon))
+
+        if optionBox:
+            self.optionIcon.paint(painter, self.getIconRect(optionBox))
+
+        # paint label
+        if option.state & utils.QStyle.State_MouseOver:
+            painter.setPen(utils.HIGHLIGHT_COLOR)
+        else:
+            painter.setPen(option.palette.color(utils.QPalette.Text))
+
+        painter.drawText(
+            label.adjusted(4, 0, 0, 0),
+            utils.Qt.AlignLeft | utils.Qt.AlignVCenter,
+            info.name
+        )
+
+    # ------------------------------------------------------------------------
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() != utils.QEvent.MouseButtonRelease:
+            return False
+
+        if event.button() != utils.Qt.LeftButton:
+            return False
+
+        info = index.data(COMMAND_ROLE)
+        if not info:
+            return False
+
+        # process click
+        pin, icon, label, optionBox = self.getRects(option.rect, info)
+        if pin.contains(event.pos()):
+            model.setPin(index, not info.pin)
+        elif optionBox and optionBox.contains(event.pos()):
+            execute(info, option=True)
+        else:
+            execute(info)
+
+        return True
@@ -0,0 +1,67 @@
+import os
+from collections import OrderedDict
+from . import utils
+
+# ----------------------------------------------------------------------------
+
+ICON_CACHE_SIZE = 256
+ICONS = OrderedDict()
+CONSTANT_ICONS = {}
+
+# ----------------------------------------------------------------------------
+
+def getIconPath(image):
+    """
+    :param str image: name of a Maya resource or path of an image
+    :return: Path of the icon
+    :rtype: str
+    """
+    if os.path.isabs(image):
+        return image
+
+    return ":/{0}".format(image)
+
+def getIcon(image):
+    """
+    Get the icon of a command image. Icons are only created when requested
+    and kept in a cache that is shared by all widgets, once the cache is
+    full the least recently used icon is removed.
+
+    :param str/None image: name of a Maya resource or path of an image
+    :return: Icon
+    :rtype: QIcon/None
+    """
+    if not image:
+        return
+
+    icon = ICONS.pop(image, None)
+    if icon is None:
+        icon = utils.QIcon(getIconPath(image))
+
+    ICONS[image] = icon
+    if len(ICONS) > ICON_CACHE_SIZE:
+        ICONS.popitem(last=False)
+
+    return icon
+
+def getConstantIcon(path):
+    """
+    Get an icon that is used by every row, these icons are created once
+    and never removed from the cache.
+
+    :param str path:
+    :return: Icon
+    :rtype: QIcon
+    """
+    icon = CONSTANT_ICONS.get(path)
+    if icon is None:
+        icon = utils.QIcon(path)
+        CONSTANT_ICONS[path] = icon
+
+    return icon
+
+def clearIcons():
+    """
+    Remove all command icons from the cache.
+    """
+    ICONS.clear()
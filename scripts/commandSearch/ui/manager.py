@@ -16,7 +16,6 @@ class ManagerMenu(utils.QMenu):
         
         # variable
         self.parent = parent
-        self.active = None
         
         # menu
         self.setObjectName("PinMenu")
@@ -91,7 +90,7 @@ class ManagerMenu(utils.QMenu):
             radio = utils.QRadioButton(name)
             
             # set active
-            if name == self.active:
+            if name == pins.getState().name:
                 radio.setChecked(True)
             
             # add pin
@@ -141,16 +140,13 @@ class ManagerMenu(utils.QMenu):
         """
         Switch active pin set to checked radio button.
         """
-        # set active
-        self.active = self.group.checkedButton().text()
-        
         # get pins
-        pinned = pins.get().get(self.active) or []
-        for k, v in commands.get().iteritems():
-            if v.get("hierarchy") in pinned:           
-                v["pin"] = True
-            else:                                             
-                v["pin"] = False
+        name = self.group.checkedButton().text()
+        pinned = pins.get().get(name) or []
+        
+        # set active, the pins are resolved once their commands are stored
+        pins.getState().set(name, [], pinned)
+        commands.resolvePins()
                 
     # --------------------------------------------------------------------
     
@@ -174,19 +170,17 @@ class ManagerMenu(utils.QMenu):
             return
         
         # get pinned name
-        pinned = []
-        for k, v in commands.get().iteritems():
-            if not v.get("pin"):
-                continue
-                
-            pinned.append(v.get("hierarchy"))
+        state = pins.getState()
+        data = commands.get()
+        pinned = [data[k].hierarchy for k in state.order if k in data]
+        pinned.extend(state.pending)
         
         if not pinned:
             raise ValueError("Search Commands: no pinned commands")
             return
         
         # set active
-        self.active = self.pinName
+        state.name = self.pinName
         pins.get()[self.pinName] = pinned
         
         # write to file
@@ -197,10 +191,7 @@ class ManagerMenu(utils.QMenu):
         Clear all pins and clear set selection.
         """
         # clear all pins
-        for k, v in commands.get().iteritems():
-            v["pin"] = False
-         
-        self.active = None
+        pins.getState().clear()
 
     def pinDelete(self):
         """
@@ -224,8 +215,9 @@ class ManagerMenu(utils.QMenu):
 
     def refresh( self ):
         """
-        Refresh command list and clear the pin set selection.
+        Refresh command list, ignoring the cache. The menubar is processed 
+        without blocking the ui. Pins are stored by the key of a command, 
+        which is built from its menus and label, so they are kept.
         """
-        commands.store()
-        self.pinClear()
+        self.parent.store(refresh=True)
         
\ No newline at end of file
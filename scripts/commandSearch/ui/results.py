@@ -1,5 +1,6 @@
 from . import utils
 from . import commands
+from .. import trace
 
 # ----------------------------------------------------------------------------
 
@@ -74,6 +75,7 @@ class ResultsMenu(utils.QMenu):
         
     # ------------------------------------------------------------------------
 
+    @trace.traced("ResultsMenu.show")
     def show(self, num):
         # hide if empty
         if not num:   
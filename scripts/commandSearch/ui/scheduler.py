@@ -0,0 +1,101 @@
+import time
+from . import utils
+
+# ----------------------------------------------------------------------------
+
+MIN_DELAY = 10
+MAX_DELAY = 300
+DELAY_FACTOR = 2.0
+SMOOTHING = 0.3
+
+# ----------------------------------------------------------------------------
+
+class Scheduler(utils.QObject):
+    """
+    Scheduler
+
+    Debounces the search queries, every scheduled query restarts the delay,
+    so a burst of keystrokes results in a single evaluation of the latest
+    query. The delay adapts to the measured cost of the recent queries,
+    cheap queries are evaluated almost immediately while expensive queries
+    wait longer for typing to settle. Queries that match the last evaluated
+    query are dropped.
+
+    :param callable callback: called with the query to evaluate
+    :param QObject parent:
+    """
+    def __init__(self, callback, parent=None):
+        utils.QObject.__init__(self, parent)
+
+        # variable
+        self.callback = callback
+        self.cost = 0.0
+        self.pending = None
+        self.last = None
+        self.started = None
+
+        # create timer
+        self.timer = utils.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.timeout)
+
+    # ------------------------------------------------------------------------
+
+    def getDelay(self):
+        """
+        :return: Delay in milliseconds based on the cost of recent queries
+        :rtype: int
+        """
+        delay = self.cost * DELAY_FACTOR
+        return int(min(MAX_DELAY, max(MIN_DELAY, delay)))
+
+    # ------------------------------------------------------------------------
+
+    def schedule(self, query):
+        """
+        Schedule the query, replacing any query still waiting to be
+        evaluated.
+
+        :param str query:
+        """
+        self.pending = query
+        self.timer.start(self.getDelay())
+
+    def timeout(self):
+        """
+        Evaluate the pending query, unless it was already evaluated last.
+        """
+        query = self.pending
+        self.pending = None
+
+        if query is None or query == self.last:
+            return
+
+        self.run(query)
+
+    def run(self, query):
+        """
+        Evaluate the query immediately, cancelling the pending query.
+
+        :param str query:
+        """
+        self.timer.stop()
+        self.pending = None
+        self.last = query
+
+        self.started = time.time()
+        self.callback(query)
+
+    def finish(self):
+        """
+        Called once the evaluation of the last query is finished, the cost
+        of the evaluation is added to the moving average. Evaluation can
+        finish asynchronously, so the cost includes the time waiting for
+        the results.
+        """
+        if self.started is None:
+            return
+
+        cost = (time.time() - self.started) * 1000
+        self.cost += (cost - self.cost) * SMOOTHING
+        self.started = None
@@ -1,5 +1,5 @@
-from . import manager, results, utils
-from .. import commands
+from . import scheduler, utils
+from .. import commands, usage
 
 # ---------------------------------------------------------------------------
 
@@ -19,17 +19,30 @@ class SearchWidget(utils.QWidget):
     * Pin set manager.
     * Search results.
     
+    Only the search field is created when the widget is installed, so it 
+    doesn't slow down Maya's startup. The pin set manager is created when 
+    it is first opened, the results, worker and watcher are created and 
+    the commands are stored when the search field is first used.
+    
     :param QWidget parent:
     """
     def __init__(self, parent=None):
         utils.QWidget.__init__(self, parent)
         
-        # get commands
-        if not commands.get():
-            commands.store()
-            
         # variable
         self.setObjectName("CMDSearch")
+        self.setStyleSheet(utils.STYLE_SHEET)
+        self.scheduler = scheduler.Scheduler(self.process, self)
+        self.generation = 0
+        
+        self.worker = None
+        self.watcher = None
+        self.window = None
+        self.menu = None
+        self.results = None
+        self.step = 0
+        self.limit = 0
+        self.hasMore = False
         
         # create layout
         layout = utils.QHBoxLayout(self)
@@ -57,70 +70,209 @@ class SearchWidget(utils.QWidget):
         layout.setContentsMargins(0,0,0,0)
         layout.setSpacing(1)
         
-        button = utils.QPushButton(self)
-        button.setFlat(True)
-        button.setFixedWidth(25)
-        button.setFixedHeight(25)   
-        button.setIcon(utils.findSearchIcon())
-        button.setIconSize(utils.QSize(25,25))   
+        self.button = utils.QPushButton(self)
+        self.button.setFlat(True)
+        self.button.setFixedWidth(25)
+        self.button.setFixedHeight(25)   
+        self.button.setIcon(utils.findSearchIcon())
+        self.button.setIconSize(utils.QSize(25,25))   
         
         self.search = SearchEdit(self, self.container)
         
         # add widgets
-        layout.addWidget(button)
+        layout.addWidget(self.button)
         layout.addWidget(self.search)
           
         # add signals
         self.search.textChanged.connect(self.typing)
         self.search.returnPressed.connect(self.enter)
         self.bar.released.connect(self.switch)
+        self.button.pressed.connect(self.createManager)
         
-        button.setMenu(manager.ManagerMenu(self))
+    # ------------------------------------------------------------------------
+    
+    def initialize(self):
+        """
+        Create the results, worker and watcher, store the commands and read
+        the usage. This is done the first time the search field is used.
+        """
+        if self.results:
+            return
+            
+        from . import results, worker
+        from .. import watcher
         
-        # window
-        self.window = results.ResultsWindow(self)
-        self.window.aboutToClose.connect(self.closeWindowEvent)
+        app = utils.QApplication.instance()
+        
+        # create worker
+        self.worker = worker.Worker()
+        self.worker.finished.connect(self.populate)
+        app.aboutToQuit.connect(self.stopWorker)
+        
+        # create watcher
+        self.watcher = watcher.Watcher(self)
+        self.watcher.updated.connect(self.storeFinished)
+        app.aboutToQuit.connect(self.watcher.stop)
+        
+        self.step = results.MENU_MAX_RESULTS
+        self.limit = self.step
         
         # menu
         self.menu = results.ResultsMenu(self)
         self.menu.aboutToClose.connect(self.closeMenuEvent)
+        self.menu.widget.requestMore.connect(self.more)
         
         self.results = self.menu
         
+        # get commands
+        if not commands.get():
+            self.store()
+            
+        self.watcher.start()
+            
+        # get usage
+        if not usage.get():
+            usage.read()
+            
+    def stopWorker(self):
+        """
+        Stop the worker thread when Maya closes. The worker lives in its own
+        thread, connecting to its stop method directly would run it in the 
+        thread it is waiting for.
+        """
+        self.worker.stop()
+        
+    def createWindow(self):
+        """
+        Create the results window the first time the results are torn off 
+        from the menu.
+        
+        :return: Results window
+        :rtype: ResultsWindow
+        """
+        if self.window:
+            return self.window
+            
+        from . import results
+        
+        self.window = results.ResultsWindow(self)
+        self.window.aboutToClose.connect(self.closeWindowEvent)
+        self.window.widget.requestMore.connect(self.more)
+        
+        return self.window
+        
+    def createManager(self):
+        """
+        Create the pin set manager the first time the button is pressed, 
+        the button shows the menu from then on. The commands are stored 
+        first, as the manager needs them to activate pin sets.
+        """
+        from . import manager
+        
+        self.initialize()
+        
+        self.button.pressed.disconnect(self.createManager)
+        self.button.setMenu(manager.ManagerMenu(self))
+        self.button.showMenu()
+            
+    # ------------------------------------------------------------------------
+    
+    def store(self, refresh=False):
+        """
+        Store the commands without blocking the ui. While the menubar is 
+        processed, the progress is displayed in the search field.
+        
+        :param bool refresh: ignore the cache and process the menubar
+        """
+        crawler = commands.store(refresh, deferred=True)
+        if not crawler:
+            self.storeFinished()
+            return
+            
+        crawler.progress.connect(self.storeProgress)
+        crawler.finished.connect(self.storeFinished)
+        
+    def storeProgress(self, num):
+        """
+        :param int num: amount of processed widgets
+        """
+        self.search.setPlaceholderText(
+            "Processing menus ( {0} )".format(num)
+        )
+        
+    def storeFinished(self):
+        """
+        Clear the progress and update the results if they are visible, as
+        they could have been searched for on partially stored commands. 
+        The pins that could not be resolved before are resolved and the 
+        dynamic menus are watched for changes.
+        """
+        commands.resolvePins()
+        if self.watcher:
+            self.watcher.hook()
+            
+        self.search.setPlaceholderText("")
+        if self.results and self.results.isVisible():
+            self.scheduler.run(self.search.text())
+        
     # ------------------------------------------------------------------------
         
     def typing(self):
         """
-        Typing callback, since there are many commands to filter through, 
-        when typing it will only start processing when there are at least
-        4 characters typed.
+        Typing callback, the search is scheduled rather than processed 
+        directly, so a burst of keystrokes is processed only once.
         """
-        self.process(4)
+        self.initialize()
+        self.limit = self.step
+        self.scheduler.schedule(self.search.text())
  
     def enter(self):  
         """
-        Enter callback, will call the process function regardless of how many
-        characters the input field holds, used when you want to search for 
-        something with less than 4 char
+        Enter callback, will process the search immediately.
         """
-        self.process(0)
+        self.initialize()
+        self.limit = self.step
+        self.scheduler.run(self.search.text())
+        
+    def more(self):
+        """
+        More callback, extends the amount of ranked commands displayed if the
+        previous search had more matches available.
+        """
+        if not self.hasMore:
+            return
+            
+        self.limit += self.step
+        self.scheduler.run(self.search.text())
         
     # ------------------------------------------------------------------------
     
-    def process(self, num):
+    def process(self, search):
         """
-        Process the search command, the number determines how many characters
-        the search string should at least be for it to continue.
+        Process the search command, the commands are filtered in the worker
+        thread. Once filtered the matching commands are populated.
         
-        :param int num: Search character number at least before process
+        :param str search: Search string
         """
         # filter search
-        search = str(self.search.text())
-        if len(search) < num:      
-            search = None
+        search = str(search) or None
           
         # filter commands
-        matches = commands.filter(search)
+        self.generation = self.worker.request(search, self.limit)
+        
+    def populate(self, generation, matches):
+        """
+        Display the matching commands in the results, matches of outdated
+        requests are ignored.
+        
+        :param int generation: Generation of the request
+        :param list matches: Matching commands
+        """
+        if generation != self.generation:
+            return
+            
+        self.scheduler.finish()
+        self.hasMore = len(matches) >= self.limit
 
         # add commands
         widget = self.results.widget
@@ -141,9 +293,9 @@ class SearchWidget(utils.QWidget):
         
     def closeMenuEvent(self):
         self.results.hide()
-        self.results = self.window
+        self.results = self.createWindow()
         
-        self.typing()
+        self.enter()
 
     # ------------------------------------------------------------------------
         
@@ -173,8 +325,9 @@ class SearchEdit(utils.QLineEdit):
     # -----------------------------------------------------------------------
 
     def mouseReleaseEvent(self, e): 
-        if e.button() == utils.Qt.LeftButton:                
-            if not self.parent.results.isVisible():
-                self.parent.typing()
+        if e.button() == utils.Qt.LeftButton:
+            results = self.parent.results
+            if not results or not results.isVisible():
+                self.parent.enter()
                 
         utils.QLineEdit.mouseReleaseEvent(self, e)
\ No newline at end of file
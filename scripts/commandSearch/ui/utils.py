@@ -1,26 +1,27 @@
 import os
-from maya import OpenMayaUI, cmds, mel
+from maya import OpenMayaUI, mel
 
-# import pyside, do qt version check for maya 2017 >
-qtVersion = cmds.about(qtVersion=True)
-if qtVersion.startswith("4") or type(qtVersion) not in [str, unicode]:
-    from PySide.QtGui import *
-    from PySide.QtCore import *
-    import shiboken
-else:
+# import pyside, pyside2 is used from maya 2017 >, trying the import is 
+# cheaper than querying the qt version from maya
+try:
     from PySide2.QtGui import *
     from PySide2.QtCore import *
     from PySide2.QtWidgets import *
     import shiboken2 as shiboken
+except ImportError:
+    from PySide.QtGui import *
+    from PySide.QtCore import *
+    import shiboken
     
 # ----------------------------------------------------------------------------
-  
-FONT = QFont()
-FONT.setFamily("Consolas")
 
-BOLT_FONT = QFont()
-BOLT_FONT.setFamily("Consolas")
-BOLT_FONT.setWeight(100)  
+HIGHLIGHT_COLOR = QColor("orange")
+LINE_COLOR = QColor("gray")
+
+STYLE_SHEET = """
+QLabel#rjCMDSearchDividerLabel{{font: bold; color: {0}; border: 0px;}}
+QFrame#rjCMDSearchDividerLine{{color: {1}; margin: 0 12 0 12;}}
+""".format(HIGHLIGHT_COLOR.name(), LINE_COLOR.name())
 
 # -----------------------------------------------------------------------------    
     
@@ -63,6 +64,18 @@ def mayaToQT(name):
     if ptr is not None:     
         return shiboken.wrapInstance(long(ptr), QWidget)
     
+def mayaToQTAction(name):
+    """
+    Maya -> QAction
+
+    :param str name: Maya name of a menu item
+    :return: QAction of parsed Maya name
+    :rtype: QAction/None
+    """
+    ptr = OpenMayaUI.MQtUtil.findMenuItem(name)
+    if ptr is not None:
+        return shiboken.wrapInstance(long(ptr), QAction)
+    
 def qtToMaya(widget):
     """
     QWidget -> Maya name
@@ -117,7 +130,9 @@ def findSearchIcon():
 
 class Divider(QWidget):     
     """
-    Divider widget that is used in the manager menu and the commands overview.
+    Divider widget that is used in the manager menu. The divider is styled
+    by the STYLE_SHEET variable, which is set once on the search widget, 
+    rather than parsing style sheets for every divider.
     
     :param QWidget parent:
     :param str group: Name to be used in the divider
@@ -125,21 +140,17 @@ class Divider(QWidget):
     def __init__(self, parent, group):
         QWidget.__init__(self, parent)
         
-        # style sheets
-        labelSS = "QLabel{font: bold; color: orange; border: 0px;}"
-        frameSS = "QFrame{color: gray; margin: 0 12 0 12;}"
-        
         # create widgets
         label = QLabel(self)
+        label.setObjectName("rjCMDSearchDividerLabel")
         label.setText(group)
         label.setFixedHeight(12)
-        label.setStyleSheet(labelSS)
         
         sep01 = QFrame(self)
         sep02 = QFrame(self)
         
         for sep in [sep01,sep02]:
-            sep.setStyleSheet(frameSS)
+            sep.setObjectName("rjCMDSearchDividerLine")
             sep.setFrameStyle(QFrame.HLine)
             sep.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Minimum)
         
@@ -0,0 +1,73 @@
+from . import utils
+from .. import commands
+
+# ----------------------------------------------------------------------------
+
+class Worker(utils.QObject):
+    """
+    Worker
+
+    Filters the commands in a separate thread. Requests are tagged with a
+    generation number and a snapshot of the commands, the results are
+    emitted with the same generation number. Requests that are outdated by
+    the time the worker gets to them are skipped. The thread is stored as
+    workerThread, so it doesn't hide the thread method of the QObject.
+    """
+    requested = utils.Signal(int, object, object, object)
+    finished = utils.Signal(int, object)
+    def __init__(self):
+        utils.QObject.__init__(self)
+
+        # variable
+        self.generation = 0
+        self.session = commands.Session()
+
+        # create thread
+        self.workerThread = utils.QThread()
+        self.moveToThread(self.workerThread)
+        self.requested.connect(self.process)
+        self.workerThread.start()
+
+    # ------------------------------------------------------------------------
+
+    def request(self, search, limit):
+        """
+        Request the commands to be filtered in the worker thread, the
+        snapshot is taken in the calling thread.
+
+        :param str search: search string to match with commands
+        :param int limit: maximum amount of ranked matches
+        :return: Generation of the request
+        :rtype: int
+        """
+        self.generation += 1
+        self.requested.emit(
+            self.generation,
+            search,
+            limit,
+            commands.snapshot()
+        )
+
+        return self.generation
+
+    def process(self, generation, search, limit, snapshot):
+        """
+        :param int generation:
+        :param str search: search string to match with commands
+        :param int limit: maximum amount of ranked matches
+        :param Snapshot snapshot:
+        """
+        if generation != self.generation:
+            return
+
+        matches = commands.filter(search, self.session, limit, snapshot)
+        self.finished.emit(generation, matches)
+
+    # ------------------------------------------------------------------------
+
+    def stop(self):
+        """
+        Stop the worker thread and wait for it to finish.
+        """
+        self.workerThread.quit()
+        self.workerThread.wait()
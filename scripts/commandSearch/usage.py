@@ -0,0 +1,168 @@
+import os
+import time
+
+from . import pins
+
+# ----------------------------------------------------------------------------
+
+USAGE_NAME = "rjCMDSearchUsage.log"
+HALF_LIFE = 7 * 24 * 60 * 60
+MIN_SCORE = 0.01
+COMPACT_LINES = 2000
+
+# ----------------------------------------------------------------------------
+
+def get():
+    """
+    Get the frecency table from the global variable, if the global variable
+    cannot be found an empty dictionary will be returned. The table maps
+    command keys to a score and the time the score was last updated.
+
+    :return: Frecency data
+    :rtype: dict
+    """
+    if not "SCORES" in globals().keys():
+        return {}
+    return globals().get("SCORES")
+
+def getScore(key, now=None):
+    """
+    Get the frecency of a command, every use adds one to the score, which
+    halves every half life.
+
+    :param str key: command key
+    :param float/None now: time to decay the score to
+    :return: Frecency
+    :rtype: float
+    """
+    entry = get().get(key)
+    if not entry:
+        return 0.0
+
+    value, t = entry
+    return decay(value, (now or time.time()) - t)
+
+def decay(value, elapsed):
+    """
+    :param float value:
+    :param float elapsed: seconds since the value was recorded
+    :return: Decayed value
+    :rtype: float
+    """
+    return value * 0.5 ** (max(elapsed, 0) / float(HALF_LIFE))
+
+# ----------------------------------------------------------------------------
+
+def findLocation():
+    """
+    The usage log is stored next to the pins file.
+
+    :return: Path to usage log file
+    :rtype: str
+    """
+    return os.path.join(os.path.dirname(pins.findLocation()), USAGE_NAME)
+
+# ----------------------------------------------------------------------------
+
+def add(key, weight, t):
+    """
+    Add the weight at the provided time to the frecency of a command.
+
+    :param str key: command key
+    :param float weight:
+    :param float t: time of use
+    """
+    scores = globals().setdefault("SCORES", {})
+
+    entry = scores.get(key)
+    if entry:
+        value, previous = entry
+        if t >= previous:
+            weight += decay(value, t - previous)
+        else:
+            weight = value + decay(weight, previous - t)
+            t = previous
+
+    scores[key] = (weight, t)
+
+def read():
+    """
+    Read the usage log into the global SCORES variable. Every line in the
+    log holds the time, weight, option box state and key of a use, each
+    use is decayed into the frecency of its command. When the log grows
+    too long, it is compacted.
+    """
+    global SCORES
+    SCORES = {}
+
+    # get usage path
+    path = findLocation()
+    if not path or not os.path.exists(path):
+        return
+
+    # read
+    lines = 0
+    with open(path, "r") as f:
+        for line in f:
+            parts = line.rstrip("\n").split("\t", 3)
+            if len(parts) != 4:
+                continue
+
+            try:
+                t, weight = float(parts[0]), float(parts[1])
+            except ValueError:
+                continue
+
+            add(parts[3], weight, t)
+            lines += 1
+
+    if lines > COMPACT_LINES:
+        compact()
+
+def log(key, option=False):
+    """
+    Add a use of a command to the frecency table and append it to the
+    usage log. The key of a menubar command is built from its menus and 
+    label, so it identifies the same command in following sessions.
+
+    :param str key: command key
+    :param bool option: if the option box was used
+    """
+    t = time.time()
+    add(key, 1.0, t)
+
+    # get usage path
+    path = findLocation()
+    if not path:
+        return
+
+    # append
+    try:
+        with open(path, "a") as f:
+            f.write("{0:.0f}\t1\t{1:d}\t{2}\n".format(t, option, key))
+    except IOError:
+        print "Search Commands: unable to log usage ( {0} )".format(path)
+
+def compact():
+    """
+    Rewrite the usage log with a single line per command, holding its
+    current frecency. Commands of which the frecency decayed to almost
+    nothing are removed.
+    """
+    path = findLocation()
+    if not path:
+        return
+
+    now = time.time()
+    lines = []
+    for key, (value, t) in get().iteritems():
+        value = decay(value, now - t)
+        if value < MIN_SCORE:
+            continue
+
+        lines.append("{0:.0f}\t{1:.4f}\t0\t{2}\n".format(now, value, key))
+
+    try:
+        pins.replaceFile(path, "".join(lines))
+    except (IOError, OSError):
+        print "Search Commands: unable to compact usage ( {0} )".format(path)
@@ -0,0 +1,133 @@
+from maya import OpenMaya
+
+from . import commands
+from .ui import utils
+
+# ----------------------------------------------------------------------------
+
+UPDATE_DELAY = 500
+HOOKED_PROPERTY = "rjCMDSearchHooked"
+
+# ----------------------------------------------------------------------------
+
+class Watcher(utils.QObject):
+    """
+    Watcher
+
+    Keeps the stored commands up to date. When a plugin is loaded or
+    unloaded, the commands are updated, only the menus and providers that
+    changed are processed again. Dynamic menus are watched as well, when
+    one is shown and its content changed it is processed again. Events are
+    collected for a short delay, so loading multiple plugins at once only
+    results in a single update.
+
+    :param QObject parent:
+    """
+    updated = utils.Signal()
+    def __init__(self, parent=None):
+        utils.QObject.__init__(self, parent)
+
+        # variable
+        self.callbacks = []
+        self.plugins = False
+        self.menus = set()
+
+        # create timer
+        self.timer = utils.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(UPDATE_DELAY)
+        self.timer.timeout.connect(self.timeout)
+
+    # ------------------------------------------------------------------------
+
+    def start(self):
+        """
+        Register the plugin callbacks and watch the dynamic menus.
+        """
+        if self.callbacks:
+            return
+
+        for message in [
+            OpenMaya.MSceneMessage.kAfterPluginLoad,
+            OpenMaya.MSceneMessage.kAfterPluginUnload,
+        ]:
+            self.callbacks.append(
+                OpenMaya.MSceneMessage.addStringArrayCallback(
+                    message,
+                    self.pluginChanged
+                )
+            )
+
+        self.hook()
+
+    def stop(self):
+        """
+        Remove the plugin callbacks.
+        """
+        for callback in self.callbacks:
+            OpenMaya.MMessage.removeCallback(callback)
+
+        self.callbacks = []
+        self.timer.stop()
+
+    # ------------------------------------------------------------------------
+
+    def hook(self):
+        """
+        Connect to the about to show signal of the dynamic menus that are
+        not watched yet.
+        """
+        for menu in utils.mayaMenu().findChildren(utils.QMenu):
+            name = menu.objectName().encode("utf-8")
+            info = commands.MENUS.get(name)
+            if not info or not info.get("dynamic"):
+                continue
+
+            if menu.property(HOOKED_PROPERTY):
+                continue
+
+            menu.setProperty(HOOKED_PROPERTY, True)
+            menu.aboutToShow.connect(self.menuShown)
+
+    # ------------------------------------------------------------------------
+
+    def pluginChanged(self, *args):
+        self.plugins = True
+        self.timer.start()
+
+    def menuShown(self):
+        menu = self.sender()
+        if menu:
+            self.menus.add(menu.objectName())
+            self.timer.start()
+
+    def timeout(self):
+        """
+        Update the commands, if the menubar is being processed the update is
+        postponed.
+        """
+        crawler = commands.CRAWLER
+        if crawler and crawler.isRunning():
+            self.timer.start()
+            return
+
+        # update
+        if self.plugins:
+            crawler = commands.update(deferred=True)
+        else:
+            menuBar = utils.mayaMenu()
+            menus = [menuBar.findChild(utils.QMenu, n) for n in self.menus]
+            crawler = commands.updateMenus([m for m in menus if m], True)
+
+        self.plugins = False
+        self.menus = set()
+
+        if not crawler:
+            self.finish()
+            return
+
+        crawler.finished.connect(self.finish)
+
+    def finish(self):
+        self.hook()
+        self.updated.emit()
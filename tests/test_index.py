@@ -0,0 +1,164 @@
+"""
+Regression test of the trigram index and the query sessions, their results
+are compared to the regex search they replaced. The commands are read from
+a menubar fixture and the searches from the keystroke corpus of the
+benchmarks, neither Qt nor Maya is needed.
+
+::
+    python -m unittest discover tests
+"""
+import os
+import re
+import sys
+import json
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE = os.path.join(ROOT, "tests", "fixtures", "menus.json")
+CORPUS = os.path.join(ROOT, "benchmarks", "keystrokes.txt")
+
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+from commandSearch import engine, index
+
+# ----------------------------------------------------------------------------
+
+EXTRA = [
+    ["uv-ed", "c.v", "edit*mesh", "poly_bevel", "del  hist", "EDGE LOOP"],
+    ["set/pref", "(sphere)", "a", "ab", "abc", " "],
+]
+
+# ----------------------------------------------------------------------------
+
+def readCorpus(path):
+    """
+    :param str path:
+    :return: Sessions of search strings
+    :rtype: list
+    """
+    sessions = [[]]
+    with open(path, "r") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if line:
+                sessions[-1].append(line)
+            elif sessions[-1]:
+                sessions.append([])
+
+    return [s for s in sessions if s]
+
+def readFixture(path):
+    """
+    Convert the recorded menubar into commands data as written to the
+    cache, the same way the menubar is processed in Maya.
+
+    :param str path:
+    :return: Commands data
+    :rtype: dict
+    """
+    with open(path, "r") as f:
+        recorded = json.load(f)
+
+    data = {}
+    stack = [(recorded["children"], [])]
+    while stack:
+        children, menus = stack.pop()
+
+        previous = None
+        for child in children:
+            if child["type"] == "menu":
+                stack.append((
+                    child["children"],
+                    menus + [[child["name"], child["title"]]]
+                ))
+            elif child["optionBox"]:
+                if previous in data:
+                    data[previous]["option"] = child["name"]
+            elif child["name"] and not child["separator"]:
+                data[child["name"]] = {
+                    "menus": menus,
+                    "label": child["text"],
+                    "image": child["image"],
+                    "option": None,
+                }
+
+            previous = child["name"]
+
+    return data
+
+def regexFilter(search, descriptors):
+    """
+    The regex search the index replaced, every whitespace separated part of
+    the search string is matched with non word characters as wildcards.
+
+    :param str search:
+    :param dict descriptors:
+    :return: Matching keys
+    :rtype: set
+    """
+    regexes = []
+    for p in (search or "").split():
+        regexes.append(
+            re.compile(r".*" + re.sub(r"\W", ".*", p.strip()) + r".*", re.I)
+        )
+
+    if not regexes:
+        return set()
+
+    return set(
+        k for k, v in descriptors.iteritems()
+        if all(regex.match(v.search) for regex in regexes)
+    )
+
+# ----------------------------------------------------------------------------
+
+class TestIndex(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = engine.Engine()
+        cls.engine.load(readFixture(FIXTURE))
+        cls.sessions = readCorpus(CORPUS) + EXTRA
+
+    # ------------------------------------------------------------------------
+
+    def testFixture(self):
+        self.assertTrue(len(self.engine) > 200)
+
+    def testIndex(self):
+        for searches in self.sessions:
+            for search in searches:
+                self.assertEqual(
+                    self.engine.index.search(index.tokenize(search)),
+                    regexFilter(search, self.engine.commands),
+                    search
+                )
+
+    def testSession(self):
+        for searches in self.sessions:
+            session = engine.Session()
+            for search in searches:
+                self.assertEqual(
+                    session.search(search, self.engine.index),
+                    regexFilter(search, self.engine.commands),
+                    search
+                )
+
+    def testMatches(self):
+        matches = regexFilter("mesh bevel", self.engine.commands)
+        self.assertTrue(matches)
+
+    def testCopy(self):
+        copy = self.engine.index.copy()
+        tokens = index.tokenize("bevel")
+        expected = copy.search(tokens)
+
+        self.engine.index.add("testBevel", "testbevel")
+        try:
+            self.assertEqual(copy.search(tokens), expected)
+            self.assertIn("testBevel", self.engine.index.search(tokens))
+        finally:
+            self.engine.index.remove("testBevel")
+
+        self.assertEqual(self.engine.index.search(tokens), expected)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+Test of the frecency of the usage log, uses that are added out of order
+should add up to the same frecency as uses added in order and compacting
+the log should keep the frecency of every command. Neither Qt nor Maya is
+needed.
+
+::
+    python -m unittest discover tests
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+from commandSearch import usage
+
+# ----------------------------------------------------------------------------
+
+KEY = "mainEditMenu|Delete by Type|History"
+
+# ----------------------------------------------------------------------------
+
+class TestUsage(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, usage.USAGE_NAME)
+        self.findLocation = usage.findLocation
+        usage.findLocation = lambda: self.path
+        usage.SCORES = {}
+
+    def tearDown(self):
+        usage.findLocation = self.findLocation
+        usage.SCORES = {}
+        shutil.rmtree(self.directory)
+
+    # ------------------------------------------------------------------------
+
+    def testDecay(self):
+        self.assertEqual(usage.decay(1.0, 0), 1.0)
+        self.assertAlmostEqual(usage.decay(1.0, usage.HALF_LIFE), 0.5)
+        self.assertAlmostEqual(usage.decay(2.0, usage.HALF_LIFE * 2), 0.5)
+        self.assertEqual(usage.decay(1.0, -usage.HALF_LIFE), 1.0)
+
+    def testAdd(self):
+        usage.add(KEY, 1.0, 0)
+        usage.add(KEY, 1.0, usage.HALF_LIFE)
+
+        value, t = usage.get()[KEY]
+        self.assertAlmostEqual(value, 1.5)
+        self.assertEqual(t, usage.HALF_LIFE)
+
+    def testAddOutOfOrder(self):
+        times = [0, usage.HALF_LIFE * 3, usage.HALF_LIFE, usage.HALF_LIFE * 2]
+        for t in times:
+            usage.add(KEY, 1.0, t)
+
+        value, t = usage.get()[KEY]
+        self.assertAlmostEqual(value, 1.875)
+        self.assertEqual(t, usage.HALF_LIFE * 3)
+
+        expected = usage.SCORES.pop(KEY)
+        for t in sorted(times):
+            usage.add(KEY, 1.0, t)
+
+        self.assertAlmostEqual(usage.get()[KEY][0], expected[0])
+        self.assertEqual(usage.get()[KEY][1], expected[1])
+
+    def testGetScore(self):
+        self.assertEqual(usage.getScore(KEY), 0.0)
+
+        usage.add(KEY, 1.0, 0)
+        self.assertAlmostEqual(usage.getScore(KEY, usage.HALF_LIFE), 0.5)
+
+    # ------------------------------------------------------------------------
+
+    def testRead(self):
+        with open(self.path, "w") as f:
+            f.write("0\t1\t0\t{0}\n".format(KEY))
+            f.write("invalid\n")
+            f.write("time\t1\t0\t{0}\n".format(KEY))
+            f.write("{0}\t1\t1\t{1}\n".format(usage.HALF_LIFE, KEY))
+
+        usage.read()
+        self.assertEqual(list(usage.get().keys()), [KEY])
+        self.assertAlmostEqual(usage.get()[KEY][0], 1.5)
+
+    def testCompact(self):
+        now = time.time()
+        usage.add(KEY, 2.0, now)
+        usage.add("old", 1.0, now - usage.HALF_LIFE * 10)
+        expected = usage.getScore(KEY, now)
+
+        usage.compact()
+        with open(self.path, "r") as f:
+            self.assertEqual(len(f.readlines()), 1)
+
+        usage.read()
+        self.assertNotIn("old", usage.get())
+        self.assertAlmostEqual(usage.getScore(KEY, now), expected, places=3)
+
+if __name__ == "__main__":
+    unittest.main()